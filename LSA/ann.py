@@ -0,0 +1,177 @@
+# imports
+
+import os
+import json
+import numpy as np
+
+FORMAT_VERSION = 1
+HEADER_FILE = "ann.json"
+ARRAYS = ("centroids", "list_offsets", "list_ids", "list_vectors")
+
+
+# class definitions
+
+class IVFIndex(object):
+    """ Inverted file index over the normalized document concept vectors
+
+        The documents are clustered with spherical k-means; every list holds
+        the documents closest to one centroid, stored contiguously (in a
+        compact dtype) so a list is scanned with one matrix product.  A query
+        scans only the n_probe lists with the closest centroids and the best
+        rerank candidates are re-scored exactly against the LSAIndex.
+
+        n_probe is the recall / latency knob: n_probe = n_lists is an exact
+        (but slower) search. """
+
+    def __init__(self, centroids, list_offsets, list_ids, list_vectors):
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_ids = list_ids
+        self.list_vectors = list_vectors
+
+    @property
+    def n_lists(self):
+        return self.centroids.shape[0]
+
+    @property
+    def n_documents(self):
+        return self.list_ids.shape[0]
+
+    @classmethod
+    def build(cls, index, n_lists = None, n_iter = 10, n_train = None, dtype = np.float32, seed = None):
+        """ Clusters the documents of index into n_lists lists
+
+            Input:  index(LSAIndex), n_lists(integer), n_iter(integer),
+                    n_train(integer), dtype(numpy dtype), seed(integer)
+
+                    n_lists:    defaults to sqrt(documents)
+                    n_train:    documents sampled to train the centroids,
+                                defaults to 64 per list
+                    dtype:      storage type of the scanned vectors
+
+            Output: IVFIndex """
+
+        rng = np.random.default_rng(seed)
+        X = _normalize(np.asarray(index.document_concept_matrix).T)
+        D = X.shape[0]
+
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(D)))
+        n_lists = min(n_lists, D)
+        if n_train is None:
+            n_train = 64 * n_lists
+
+        sample = X[rng.choice(D, min(n_train, D), replace = False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace = False)]
+
+        for i in range(n_iter):
+            labels = _assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength = n_lists) == 0
+            sums[empty] = sample[rng.choice(len(sample), empty.sum())]
+            centroids = _normalize(sums)
+
+        labels = _assign(X, centroids)
+        list_ids = np.argsort(labels, kind = "stable")
+        list_offsets = np.zeros(n_lists + 1, dtype = np.int64)
+        list_offsets[1:] = np.cumsum(np.bincount(labels, minlength = n_lists))
+
+        return cls(centroids, list_offsets, list_ids, X[list_ids].astype(dtype))
+
+    def search(self, index, Q, top_k = 10, n_probe = 8, rerank = None):
+        """ Approximate top_k documents for every row of Q
+
+            Input:  index(LSAIndex the IVFIndex was built for),
+                    Q(queries x k array), top_k(integer), n_probe(integer),
+                    rerank(integer)
+
+                    rerank: shortlist size re-scored exactly, defaults to
+                            4 * top_k
+
+            Output: list with one (documents, scores) pair per query """
+
+        if index.n_documents != self.n_documents:
+            raise ValueError("IVF index covers {} documents, the index has {}; rebuild it".format(
+                self.n_documents, index.n_documents))
+
+        n_probe = min(n_probe, self.n_lists)
+        if rerank is None:
+            rerank = 4 * top_k
+
+        Qn = _normalize(Q)
+        probes = np.argpartition(-(Qn @ self.centroids.T), n_probe - 1, axis = 1)[:, :n_probe]
+
+        results = []
+        for q, lists in zip(Qn, probes):
+            if not q.any():
+                results.append((np.zeros(0, dtype = np.int64), np.zeros(0)))
+                continue
+
+            slices = [slice(self.list_offsets[l], self.list_offsets[l + 1]) for l in lists]
+            ids = np.concatenate([self.list_ids[s] for s in slices])
+            approx = np.concatenate([self.list_vectors[s] for s in slices]) @ q.astype(self.list_vectors.dtype)
+
+            if len(ids) > rerank:
+                ids = ids[np.argpartition(-approx, rerank - 1)[:rerank]]
+            ids = np.sort(ids)
+
+            norms = np.asarray(index.document_norms[ids])
+            scores = q @ np.asarray(index.document_concept_matrix[:, ids])
+            np.divide(scores, norms, out = scores, where = norms > 0)
+            scores[norms == 0] = 0
+
+            order = np.argsort(-scores, kind = "stable")[:top_k]
+            results.append((ids[order], scores[order]))
+
+        return results
+
+    def save(self, path):
+        """ Writes the lists next to an LSAIndex saved in the directory path """
+
+        for name in ARRAYS:
+            tmp = os.path.join(path, "ann_" + name + ".tmp.npy")
+            np.save(tmp, np.ascontiguousarray(getattr(self, name)))
+            os.replace(tmp, os.path.join(path, "ann_" + name + ".npy"))
+
+        header = {
+            "format_version": FORMAT_VERSION,
+            "n_lists": int(self.n_lists),
+            "n_documents": int(self.n_documents),
+            "dtype": str(self.list_vectors.dtype),
+        }
+        with open(os.path.join(path, HEADER_FILE), "w") as f:
+            json.dump(header, f, indent = 1)
+
+    @classmethod
+    def load(cls, path, mmap = True):
+        """ Opens the lists saved in the directory path, None if there are none """
+
+        if not os.path.exists(os.path.join(path, HEADER_FILE)):
+            return None
+
+        with open(os.path.join(path, HEADER_FILE)) as f:
+            header = json.load(f)
+
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError("IVF index in {} has format version {}, expected {}".format(
+                path, header.get("format_version"), FORMAT_VERSION))
+
+        mode = "r" if mmap else None
+        return cls(**{name: np.load(os.path.join(path, "ann_" + name + ".npy"), mmap_mode = mode) for name in ARRAYS})
+
+
+# function definitions
+
+def _normalize(X):
+    norms = np.linalg.norm(X, axis = -1, keepdims = True)
+    return np.divide(X, norms, out = np.zeros(X.shape), where = norms > 0)
+
+
+def _assign(X, centroids, chunk = 65536):
+    """ Index of the most similar centroid for every row of X """
+
+    labels = np.empty(len(X), dtype = np.int64)
+    for start in range(0, len(X), chunk):
+        labels[start:start + chunk] = np.argmax(X[start:start + chunk] @ centroids.T, axis = 1)
+    return labels
@@ -0,0 +1,139 @@
+# imports
+
+import sys
+import json
+import platform
+import tracemalloc
+import resource
+from time import perf_counter
+import numpy as np
+import scipy
+from corpus import tokenize, term_document_matrix
+from decomposition import truncated_svd
+from index import LSAIndex
+from query import score_queries
+from ann import IVFIndex
+from ingest import ingest
+
+
+# function definitions
+
+def synthetic_corpus(n_documents, n_terms, mean_length = 100, zipf = 1.1, seed = 0):
+    """ Random documents with Zipf distributed word frequencies
+
+        Input:  n_documents(integer), n_terms(integer), mean_length(integer),
+                zipf(float), seed(integer)
+
+        Output: list of document strings """
+
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(["t{}".format(i) for i in range(n_terms)])
+    p = 1 / np.arange(1, n_terms + 1) ** zipf
+    p /= p.sum()
+
+    lengths = np.maximum(rng.poisson(mean_length, n_documents), 1)
+    words = vocabulary[rng.choice(n_terms, lengths.sum(), p = p)]
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+
+    return [" ".join(words[bounds[i]:bounds[i + 1]]) for i in range(n_documents)]
+
+
+def run_benchmark(documents = None, matrix = None, k = 100, backend = "arpack", n_queries = 1000,
+                  query_length = 3, top_k = 10, n_probe = 8, seed = 0, trace_memory = False):
+    """ Times every stage of the LSA pipeline separately
+
+        Input:  documents(list of strings) or matrix((A, words) pair, e.g.
+                from ingest, skips tokenization), k(integer), backend(string),
+                n_queries(integer), query_length(integer), top_k(integer),
+                n_probe(integer), seed(integer), trace_memory(boolean)
+
+                trace_memory:   also record the peak memory allocated inside
+                                every stage with tracemalloc; this slows the
+                                Python heavy stages down considerably
+
+        Output: dict with seconds and the process peak RSS after every stage
+                (plus the traced peak) and the query throughput """
+
+    rng = np.random.default_rng(seed)
+    stages = dict()
+
+    def stage(name, fn, *args, **kwargs):
+        if trace_memory:
+            tracemalloc.start()
+        start = perf_counter()
+        result = fn(*args, **kwargs)
+        stages[name] = {"seconds": perf_counter() - start, "max_rss_kb": _max_rss_kb()}
+        if trace_memory:
+            stages[name]["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return result
+
+    if matrix is None:
+        tokens = stage("tokenize", lambda: [tokenize(d) for d in documents])
+        A, words = stage("matrix", term_document_matrix, tokens)
+    else:
+        A, words = matrix
+
+    k = min(k, min(A.shape) - 1)
+    U, s, V = stage("decomposition", truncated_svd, A, k, backend = backend, seed = seed)
+    index = stage("index", LSAIndex, words, U * s, s, np.ascontiguousarray(s[:, None] * V.T))
+
+    queries = [list(rng.choice(index.vocabulary, query_length)) for i in range(n_queries)]
+    stage("query", score_queries, index, queries, top_k)
+    ann = stage("ann_build", IVFIndex.build, index, seed = seed)
+    stage("query_ann", score_queries, index, queries, top_k, ann = ann, n_probe = n_probe)
+
+    return {
+        "config": {
+            "documents": int(A.shape[1]),
+            "terms": int(A.shape[0]),
+            "nonzeros": int(A.nnz),
+            "concepts": int(k),
+            "backend": backend,
+            "queries": n_queries,
+            "query_length": query_length,
+            "top_k": top_k,
+            "n_probe": n_probe,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "machine": platform.machine(),
+        },
+        "stages": stages,
+        "queries_per_second": n_queries / stages["query"]["seconds"],
+        "queries_per_second_ann": n_queries / stages["query_ann"]["seconds"],
+        "max_rss_kb": _max_rss_kb(),
+    }
+
+
+def _max_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# Driver Code
+if __name__ == "__main__":
+    if len(sys.argv) < 5:
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 benchmark.py documents terms concepts output.json [corpus files]")
+        print("                documents and terms are ignored when corpus files are given")
+        quit()
+
+    n_documents, n_terms, k = [int(i) for i in sys.argv[1:4]]
+
+    if len(sys.argv) > 5:
+        start = perf_counter()
+        matrix = ingest(sys.argv[5:])
+        ingest_stage = {"seconds": perf_counter() - start, "max_rss_kb": _max_rss_kb()}
+        results = run_benchmark(matrix = matrix, k = k)
+        results["stages"]["ingest"] = ingest_stage
+    else:
+        results = run_benchmark(synthetic_corpus(n_documents, n_terms), k = k)
+
+    with open(sys.argv[4], "w") as f:
+        json.dump(results, f, indent = 1, sort_keys = True)
+
+    for name, values in results["stages"].items():
+        print("{:14} {:10.3f} s".format(name, values["seconds"]))
+    print("{:14} {:10.1f}".format("queries/s", results["queries_per_second"]))
@@ -0,0 +1,100 @@
+# imports
+
+from collections import OrderedDict
+from corpus import tokenize
+
+
+# class definitions
+
+class QueryCache(object):
+    """ Bounded LRU cache of query results for one LSAIndex at a time
+
+        Queries are keyed on their sorted token multiset, so "dagger romeo"
+        and "Romeo, dagger" share an entry, together with the search options.
+        Every entry belongs to an index version; when a different version
+        (a rebuilt index, or one with folded-in documents) is queried the
+        whole cache is dropped.
+
+        Input:  maxsize(integer), max_bytes(integer or None)
+
+                maxsize:    maximum number of cached queries
+                max_bytes:  optional bound on the memory of the cached result
+                            arrays """
+
+    def __init__(self, maxsize = 4096, max_bytes = None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.version = None
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, query, *options):
+        tokens = tokenize(query) if isinstance(query, str) else list(query)
+        return (tuple(sorted(tokens)),) + options
+
+    def get(self, index, key):
+        """ Returns the cached result for key, or None """
+
+        self._check_version(index)
+        result = self.entries.get(key)
+
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, index, key, result):
+        self._check_version(index)
+
+        for array in result:
+            array.setflags(write = False)
+
+        if key in self.entries:
+            self.nbytes -= _size(self.entries.pop(key))
+        self.entries[key] = result
+        self.nbytes += _size(result)
+
+        while len(self.entries) > self.maxsize or (self.max_bytes is not None and self.nbytes > self.max_bytes):
+            dummy, evicted = self.entries.popitem(last = False)
+            self.nbytes -= _size(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _check_version(self, index):
+        if index.version != self.version:
+            if self.entries:
+                self.invalidations += 1
+            self.clear()
+            self.version = index.version
+
+
+# function definitions
+
+def _size(result):
+    return sum(array.nbytes for array in result)
@@ -0,0 +1,86 @@
+# imports
+
+import re
+import zlib
+from collections import Counter
+import numpy as np
+from scipy import sparse
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+# function definitions
+
+def tokenize(document, min_length = 2, stop_words = None):
+    """ Splits a document into lowercase word tokens
+
+        Input:  document(string), min_length(integer), stop_words(set)
+
+                min_length: tokens shorter than this are dropped
+                stop_words: tokens in this set are dropped
+
+        Output: list of tokens in document order """
+
+    tokens = [t for t in TOKEN_PATTERN.findall(document.lower()) if len(t) >= min_length]
+    if stop_words:
+        tokens = [t for t in tokens if t not in stop_words]
+    return tokens
+
+
+def term_hash(terms, n_features):
+    """ Row of every term under the hashing trick (stable across processes) """
+
+    return np.array([zlib.crc32(t.encode("utf-8")) % n_features for t in terms], dtype = np.int64)
+
+
+def term_document_matrix(documents, min_length = 2, vocabulary = None, dtype = np.float64,
+                         stop_words = None, n_features = None):
+    """ Builds the sparse term-document count matrix in a single pass
+
+        Every document is tokenized exactly once; the vocabulary and the
+        counts are filled in the same loop, so only whole tokens are counted
+        (the term "die" does not match inside "died").
+
+        Input:  documents(iterable of strings or token lists), min_length(integer),
+                vocabulary(dict term -> row, optional), stop_words(set),
+                n_features(integer)
+
+                vocabulary: an existing mapping to extend; new terms get the
+                            next free row in order of first occurrence
+                n_features: use the hashing trick, a term's row is
+                            term_hash(term) and no vocabulary is kept
+
+        Output: A(scipy.sparse.csc_matrix, terms x documents) and words, the
+                list of terms where words[i] labels row i of A (None when
+                hashing) """
+
+    if vocabulary is None:
+        vocabulary = dict()
+
+    indices = []
+    indptr = [0]
+    data = []
+
+    for d in documents:
+        counts = Counter(tokenize(d, min_length, stop_words) if isinstance(d, str) else d)
+        if n_features:
+            indices.extend(term_hash(counts, n_features))
+        else:
+            for term in counts:
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+        data.extend(counts.values())
+        indptr.append(len(indices))
+
+    A = sparse.csc_matrix(
+        (np.array(data, dtype = dtype), np.array(indices, dtype = np.int64), np.array(indptr, dtype = np.int64)),
+        shape = (n_features or len(vocabulary), len(indptr) - 1))
+    A.sum_duplicates()
+
+    if n_features:
+        return A, None
+
+    words = [None] * len(vocabulary)
+    for term, i in vocabulary.items():
+        words[i] = term
+
+    return A, words
@@ -0,0 +1,99 @@
+# imports
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import svds
+
+
+# function definitions
+
+def truncated_svd(A, k, backend = "arpack", dtype = np.float64, seed = None, **options):
+    """ Computes the rank k singular value decomposition A ~ U_k Σ_k V_k^T
+
+        Works directly on the (sparse) term-document matrix, A^T A is never
+        formed.
+
+        Input:  A(matrix, terms x documents), k(integer), backend(string or
+                callable), dtype(np.float32 or np.float64), seed(integer)
+
+                backend:    "arpack" (Lanczos via scipy svds), "randomized"
+                            or "dense"; a callable with the signature
+                            backend(A, k, rng, **options) is used as is
+                options:    passed on to the backend, e.g. n_oversamples and
+                            n_iter for "randomized"
+
+        Output: U(terms x k), s(k), V(documents x k) with the singular
+                values in s sorted from largest to smallest """
+
+    if k < 1 or k > min(A.shape):
+        raise ValueError("k must be between 1 and {}, got {}".format(min(A.shape), k))
+
+    if callable(backend):
+        fn = backend
+    elif backend in BACKENDS:
+        fn = BACKENDS[backend]
+    else:
+        raise ValueError("Unknown SVD backend {!r}, use one of {}".format(backend, sorted(BACKENDS)))
+
+    A = A.astype(dtype)
+    U, s, V = fn(A, k, np.random.default_rng(seed), **options)
+
+    order = np.argsort(s)[::-1]
+    U, s, V = U[:, order], s[order], V[:, order]
+
+    return _flip_signs(U.astype(dtype), s.astype(dtype), V.astype(dtype))
+
+
+def arpack_svd(A, k, rng):
+    """ Lanczos (ARPACK) backend, needs k < min(A.shape) """
+
+    if k >= min(A.shape):
+        return dense_svd(A, k, rng)
+
+    v0 = rng.uniform(-1, 1, min(A.shape)).astype(A.dtype)
+    U, s, Vt = svds(A, k = k, v0 = v0)
+    return U, s, Vt.T
+
+
+def randomized_svd(A, k, rng, n_oversamples = 10, n_iter = 4):
+    """ Randomized range finder with power iterations (Halko, Martinsson and Tropp) """
+
+    l = min(k + n_oversamples, min(A.shape))
+    Y = A @ rng.standard_normal((A.shape[1], l)).astype(A.dtype)
+
+    for i in range(n_iter):
+        Q, dummy = np.linalg.qr(Y)
+        Z, dummy = np.linalg.qr(A.T @ Q)
+        Y = A @ Z
+
+    Q, dummy = np.linalg.qr(Y)
+    B = np.asarray(A.T @ Q).T
+    Ub, s, Vt = np.linalg.svd(B, full_matrices = False)
+
+    return (Q @ Ub)[:, :k], s[:k], Vt[:k].T
+
+
+def dense_svd(A, k, rng):
+    """ Full LAPACK decomposition, only meant for small matrices """
+
+    if sparse.issparse(A):
+        A = A.toarray()
+
+    U, s, Vt = np.linalg.svd(A, full_matrices = False)
+    return U[:, :k], s[:k], Vt[:k].T
+
+
+def _flip_signs(U, s, V):
+    """ Makes the largest entry of every left singular vector positive so
+        that results do not depend on the backend's sign convention """
+
+    signs = np.sign(U[np.argmax(np.abs(U), axis = 0), np.arange(U.shape[1])])
+    signs[signs == 0] = 1
+    return U * signs, s, V * signs
+
+
+BACKENDS = {
+    "arpack": arpack_svd,
+    "randomized": randomized_svd,
+    "dense": dense_svd,
+}
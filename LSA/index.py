@@ -0,0 +1,213 @@
+# imports
+
+import os
+import json
+import shutil
+import uuid
+import numpy as np
+from scipy import sparse
+from corpus import term_document_matrix, term_hash
+from decomposition import truncated_svd
+from vocabulary import prune_vocabulary, weight_matrix
+
+FORMAT_VERSION = 1
+HEADER_FILE = "header.json"
+ARRAYS = ("vocabulary", "sorted_terms", "sorted_rows", "term_concept_matrix",
+          "singular_values", "document_concept_matrix", "document_norms")
+OPTIONAL_ARRAYS = ("term_weights", "kept_rows")
+
+
+# class definitions
+
+class LSAIndex(object):
+    """ Term and document concept matrices of a decomposed corpus
+
+        vocabulary[i] is the term of row i of term_concept_matrix (terms x k),
+        document_concept_matrix is k x documents.  The term -> row mapping is
+        kept as a sorted term array plus row numbers, so lookups are a binary
+        search over a memory-mapped array and no dict has to be built when an
+        index is opened.
+
+        version identifies the content: every newly built or updated index
+        gets a fresh one, a saved index keeps it.
+
+        A weighted index keeps the global term_weights of its weighting
+        scheme, so documents added later are weighted the same way.  With
+        n_features set the rows are term hashes and the vocabulary is empty.
+
+        pruning holds the min_df / max_df / max_features the vocabulary was
+        pruned with; a pruned vocabulary is closed, documents folded in
+        later only use the kept terms (kept_rows marks the hash rows a
+        hashed index kept). """
+
+    def __init__(self, vocabulary, term_concept_matrix, singular_values, document_concept_matrix,
+                 sorted_terms = None, sorted_rows = None, document_norms = None, version = None,
+                 term_weights = None, weighting = None, n_features = None, pruning = None, kept_rows = None):
+        self.vocabulary = np.asarray(vocabulary if vocabulary is not None else [], dtype = np.str_)
+        self.term_concept_matrix = term_concept_matrix
+        self.singular_values = singular_values
+        self.document_concept_matrix = document_concept_matrix
+
+        if sorted_terms is None or sorted_rows is None:
+            sorted_rows = np.argsort(self.vocabulary, kind = "stable")
+            sorted_terms = self.vocabulary[sorted_rows]
+        self.sorted_terms = sorted_terms
+        self.sorted_rows = sorted_rows
+
+        if document_norms is None:
+            document_norms = np.linalg.norm(document_concept_matrix, axis = 0)
+        self.document_norms = document_norms
+        self.version = version if version is not None else uuid.uuid4().hex
+        self.term_weights = term_weights
+        self.weighting = weighting
+        self.n_features = n_features
+        self.pruning = pruning or None
+        self.kept_rows = kept_rows
+
+    @property
+    def closed_vocabulary(self):
+        pruning = self.pruning or dict()
+        return (pruning.get("min_df", 1) != 1 or pruning.get("max_df", 1.0) != 1.0 or
+                pruning.get("max_features") is not None)
+
+    @property
+    def n_terms(self):
+        return self.term_concept_matrix.shape[0]
+
+    @property
+    def n_documents(self):
+        return self.document_concept_matrix.shape[1]
+
+    @property
+    def concepts(self):
+        return self.term_concept_matrix.shape[1]
+
+    def term_rows(self, terms):
+        """ Returns the row of every term in terms, -1 for unknown terms """
+
+        if self.n_features:
+            return term_hash(terms, self.n_features)
+
+        terms = np.asarray(terms, dtype = np.str_).reshape(-1)
+        rows = np.full(len(terms), -1, dtype = np.int64)
+        if len(self.sorted_terms) == 0 or len(terms) == 0:
+            return rows
+
+        pos = np.searchsorted(self.sorted_terms, terms)
+        pos[pos == len(self.sorted_terms)] = 0
+        found = self.sorted_terms[pos] == terms
+        rows[found] = self.sorted_rows[pos[found]]
+        return rows
+
+    def term_vector(self, term):
+        """ Returns the concept vector of term, or None if term is unknown """
+
+        row = self.term_rows([term])[0]
+        return None if row < 0 else self.term_concept_matrix[row]
+
+    def save(self, path):
+        """ Writes the index to the directory path
+
+            The arrays are written as .npy files next to a JSON header holding
+            the format version.  The directory is written under a temporary
+            name and swapped in, so readers never see a half written index. """
+
+        tmp = path.rstrip(os.sep) + ".tmp"
+        if os.path.exists(tmp):
+            shutil.rmtree(tmp)
+        os.makedirs(tmp)
+
+        for name in ARRAYS + OPTIONAL_ARRAYS:
+            if getattr(self, name) is not None:
+                np.save(os.path.join(tmp, name + ".npy"), np.ascontiguousarray(getattr(self, name)))
+
+        header = {
+            "format_version": FORMAT_VERSION,
+            "version": self.version,
+            "n_terms": int(self.n_terms),
+            "n_documents": int(self.n_documents),
+            "concepts": int(self.concepts),
+            "dtype": str(self.term_concept_matrix.dtype),
+            "weighting": self.weighting,
+            "n_features": self.n_features,
+            "pruning": self.pruning,
+        }
+        with open(os.path.join(tmp, HEADER_FILE), "w") as f:
+            json.dump(header, f, indent = 1)
+
+        old = path.rstrip(os.sep) + ".old"
+        if os.path.exists(path):
+            os.rename(path, old)
+        os.rename(tmp, path)
+        if os.path.exists(old):
+            shutil.rmtree(old)
+
+    @classmethod
+    def load(cls, path, mmap = True):
+        """ Opens an index written by save
+
+            With mmap the arrays are memory-mapped read only, so opening is
+            independent of the index size and processes opening the same
+            index share its pages through the OS page cache. """
+
+        with open(os.path.join(path, HEADER_FILE)) as f:
+            header = json.load(f)
+
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError("Index {} has format version {}, expected {}".format(
+                path, header.get("format_version"), FORMAT_VERSION))
+
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode = mode) for name in ARRAYS}
+        for name in OPTIONAL_ARRAYS:
+            if os.path.exists(os.path.join(path, name + ".npy")):
+                arrays[name] = np.load(os.path.join(path, name + ".npy"), mmap_mode = mode)
+
+        return cls(version = header.get("version"), weighting = header.get("weighting"),
+                   n_features = header.get("n_features"), pruning = header.get("pruning"), **arrays)
+
+
+# function definitions
+
+def build_index(documents, k, backend = "arpack", dtype = np.float64, seed = None, weighting = None,
+                stop_words = None, n_features = None, **pruning):
+    """ Tokenizes and decomposes documents into an LSAIndex
+
+        Input:  documents(iterable of strings), k(integer), backend(string),
+                dtype(np.float32 or np.float64), seed(integer),
+                weighting(string), stop_words(set), n_features(integer)
+
+                k:          number of concepts, capped at the matrix rank bound
+                weighting:  None (raw counts), "tfidf" or "log_entropy"
+                n_features: hash terms into this many rows instead of
+                            keeping a vocabulary
+                pruning:    min_df, max_df and max_features, see
+                            vocabulary.prune_vocabulary
+
+        Output: LSAIndex """
+
+    A, words = term_document_matrix(documents, dtype = dtype, stop_words = stop_words, n_features = n_features)
+    return index_from_matrix(A, words, k, backend, dtype, seed, weighting, n_features, **pruning)
+
+
+def index_from_matrix(A, words, k, backend = "arpack", dtype = np.float64, seed = None, weighting = None,
+                      n_features = None, **pruning):
+    """ Prunes, weights and decomposes a term-document matrix (e.g. from
+        ingest) into an LSAIndex """
+
+    kept_rows = None
+    if pruning:
+        A, words = prune_vocabulary(A, words, **pruning)
+        if words is None:
+            kept_rows = sparse.csr_matrix(A).getnnz(axis = 1) > 0
+
+    term_weights = None
+    if weighting is not None:
+        A, term_weights = weight_matrix(A, weighting)
+
+    k = min(k, min(A.shape))
+    U, s, V = truncated_svd(A, k, backend = backend, dtype = dtype, seed = seed)
+
+    return LSAIndex(words, U * s, s, np.ascontiguousarray(s[:, None] * V.T),
+                    term_weights = term_weights, weighting = weighting, n_features = n_features, pruning = pruning,
+                    kept_rows = kept_rows)
@@ -0,0 +1,201 @@
+# imports
+
+import os
+import json
+from glob import glob
+from multiprocessing import Pool
+import numpy as np
+from scipy import sparse
+from corpus import term_document_matrix
+
+SHARD_BYTES = 64 * 2**20
+SHARD_FILES = 256
+SOURCES_FILE = "sources.json"
+
+
+# function definitions
+
+def make_shards(paths, mode = "line", shard_bytes = SHARD_BYTES, shard_files = SHARD_FILES):
+    """ Splits the input files into shards of roughly equal work
+
+        Input:  paths(list of file names or glob patterns), mode(string),
+                shard_bytes(integer), shard_files(integer)
+
+                mode:   "line", every line of every file is a document; files
+                        are cut into byte ranges of about shard_bytes
+                        "file", every file is a document; files are grouped
+                        shard_files at a time
+
+        Output: list of shards in document order, each shard a tuple
+                (mode, list of (path, start, end)) """
+
+    files = []
+    for p in paths:
+        matches = sorted(glob(p))
+        files.extend(matches if matches else [p])
+
+    shards = []
+    if mode == "line":
+        for f in files:
+            size = os.path.getsize(f)
+            for start in range(0, max(size, 1), shard_bytes):
+                shards.append(("line", [(f, start, min(start + shard_bytes, size))]))
+    elif mode == "file":
+        for i in range(0, len(files), shard_files):
+            shards.append(("file", [(f, 0, None) for f in files[i:i + shard_files]]))
+    else:
+        raise ValueError("Unknown ingestion mode {!r}, use \"line\" or \"file\"".format(mode))
+
+    return shards
+
+
+def shard_documents(shard):
+    """ Yields (path, byte offset, raw bytes) of every document of one shard
+
+        In line mode a byte range holds the lines that start inside it, so
+        neighbouring ranges never split or repeat a line. """
+
+    mode, pieces = shard
+    for path, start, end in pieces:
+        with open(path, "rb") as f:
+            if mode == "file":
+                yield path, 0, f.read()
+                continue
+
+            if start > 0:
+                f.seek(start - 1)
+                f.readline()
+            while f.tell() < end:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                yield path, offset, line
+
+
+def read_shard(shard):
+    """ Yields the documents of one shard """
+
+    for path, offset, raw in shard_documents(shard):
+        yield raw.decode("utf-8", errors = "replace")
+
+
+def count_shard(args):
+    """ Worker: partial vocabulary and count matrix of one shard """
+
+    shard, min_length, stop_words, n_features = args
+    return term_document_matrix(read_shard(shard), min_length = min_length, stop_words = stop_words,
+                                n_features = n_features)
+
+
+def merge_counts(parts):
+    """ Merges partial (A, words) results given in document order
+
+        Terms are numbered by first occurrence over the concatenated shards,
+        which is exactly the numbering a serial term_document_matrix run over
+        the same documents produces, whatever the number of workers.
+        Hashed parts (words is None) already share their rows.
+
+        Output: A(scipy.sparse.csc_matrix), words """
+
+    vocabulary = dict()
+    data = [np.zeros(0)]
+    indices = [np.zeros(0, dtype = np.int64)]
+    indptr = [np.zeros(1, dtype = np.int64)]
+    n_documents = 0
+    n_features = None
+
+    for A, words in parts:
+        if words is None:
+            n_features = A.shape[0]
+            indices.append(A.indices)
+        else:
+            remap = np.array([vocabulary.setdefault(w, len(vocabulary)) for w in words], dtype = np.int64)
+            indices.append(remap[A.indices])
+        data.append(A.data)
+        indptr.append(A.indptr[1:] + indptr[-1][-1])
+        n_documents += A.shape[1]
+
+    A = sparse.csc_matrix((np.concatenate(data), np.concatenate(indices), np.concatenate(indptr)),
+                          shape = (n_features or len(vocabulary), n_documents))
+    A.sort_indices()
+
+    if n_features:
+        return A, None
+
+    words = [None] * len(vocabulary)
+    for term, i in vocabulary.items():
+        words[i] = term
+
+    return A, words
+
+
+def ingest(paths, mode = "line", processes = None, min_length = 2, shard_bytes = SHARD_BYTES, shard_files = SHARD_FILES,
+           stop_words = None, n_features = None):
+    """ Tokenizes and counts a corpus on all cores
+
+        Every worker reads and counts its own shards; the parent only merges
+        the partial matrices, in shard order, as they come in.
+
+        Input:  paths(list of file names or glob patterns), mode(string),
+                processes(integer, defaults to the number of cores),
+                min_length(integer), shard_bytes(integer), shard_files(integer),
+                stop_words(set), n_features(integer), see term_document_matrix
+
+        Output: A(scipy.sparse.csc_matrix, terms x documents), words """
+
+    shards = make_shards(paths, mode, shard_bytes, shard_files)
+    tasks = [(shard, min_length, stop_words, n_features) for shard in shards]
+
+    if processes == 1 or len(shards) <= 1:
+        return merge_counts(map(count_shard, tasks))
+
+    with Pool(processes = processes or os.cpu_count()) as workers:
+        return merge_counts(workers.imap(count_shard, tasks))
+
+
+def save_sources(index_path, paths, mode = "line", shard_bytes = SHARD_BYTES, shard_files = SHARD_FILES):
+    """ Records where every document ingest(paths, mode) counted comes from,
+        in the directory of the index built from it, so results can be
+        shown without keeping the texts in memory
+
+        Input:  index_path(directory of a saved index), paths, mode,
+                shard_bytes, shard_files(as given to ingest) """
+
+    files = []
+    file_ids = []
+    offsets = []
+    for shard in make_shards(paths, mode, shard_bytes, shard_files):
+        for path, offset, raw in shard_documents(shard):
+            if not files or files[-1] != path:
+                files.append(path)
+            file_ids.append(len(files) - 1)
+            offsets.append(offset)
+
+    np.save(os.path.join(index_path, "source_files.npy"), np.array(file_ids, dtype = np.int32))
+    np.save(os.path.join(index_path, "source_offsets.npy"), np.array(offsets, dtype = np.int64))
+    with open(os.path.join(index_path, SOURCES_FILE), "w") as f:
+        json.dump({"mode": mode, "files": [os.path.abspath(p) for p in files]}, f, indent = 1)
+
+
+def load_sources(index_path):
+    """ Opens the document sources saved by save_sources, None if the index
+        was not built from files
+
+        Output: function document number -> document text """
+
+    if not os.path.exists(os.path.join(index_path, SOURCES_FILE)):
+        return None
+
+    with open(os.path.join(index_path, SOURCES_FILE)) as f:
+        header = json.load(f)
+    file_ids = np.load(os.path.join(index_path, "source_files.npy"), mmap_mode = "r")
+    offsets = np.load(os.path.join(index_path, "source_offsets.npy"), mmap_mode = "r")
+
+    def document(i):
+        with open(header["files"][file_ids[i]], "rb") as f:
+            f.seek(int(offsets[i]))
+            raw = f.read() if header["mode"] == "file" else f.readline()
+        return raw.decode("utf-8", errors = "replace")
+
+    return document
@@ -1,7 +1,20 @@
 # imports
 
+import sys
 import numpy as np
-import re
+from index import LSAIndex, build_index, index_from_matrix
+from ingest import ingest, save_sources, load_sources
+from ann import IVFIndex
+from query import score_queries
+
+# Settings
+
+CONCEPTS = 300
+SVD_BACKEND = "arpack"
+WEIGHTING = None            # None, "tfidf" or "log_entropy"
+VOCABULARY = dict(min_df = 1, max_df = 1.0, max_features = None)
+N_LISTS = None              # IVF lists built next to the index, None for sqrt(documents), 0 for no ANN layer
+N_PROBE = 8                 # IVF lists scanned per query
 
 # Document strings
 
@@ -13,79 +26,45 @@ d5 = """ Did you know, New-Hampshire is in New-England. """
 
 documents = [d1,d2,d3,d4,d5]
 
-# Pre-process documents
-
-words = set()
-for d in documents:
-    d = d.lower()
-    for word in re.compile(r'\w+').findall(d):
-        words.add(word)
-
-for word in list(words):
-    if len(word) == 1:
-        words.remove(word)
-
-words = list(words)
-
-# Create "A" matrix
-
-A = np.zeros((len(words), len(documents)))
-
-for j, d in enumerate(documents):
-    d = d.lower()
-    for i, word in enumerate(words):
-        counter = 0
-        for match in re.compile(word).finditer(d):
-            counter += 1
-
-        A[i][j] = counter
-
-B = np.matmul(np.transpose(A), A)
-eig_value, eig_vector = np.linalg.eig(B)
-
-sigma = np.identity(len(eig_value))
-for i, val in enumerate(eig_value):
-    sigma[i][i] = val
-
-U = eig_vector
-
-S = np.zeros(A.shape)
-for i in range(len(eig_vector)):
-    sig = eig_value[i]
-    y = (1/sig)*np.matmul(A, eig_vector[:][i])
-    S[:, i] = y
-
-term_concept_matrix = np.matmul(S, sigma)
-
-# Create Search dict
-
-terms = dict()
-
-for i, word in enumerate(words):
-    terms[word] = term_concept_matrix[i]
-
-# search query
-
-query = input("Query : ")
-query = query.strip().split()
-
-query_vectors = []
-for word in query:
-    query_vectors.append(terms[word])
-
-query = np.average(np.transpose(query_vectors), axis=1)
-
-# distance calculation
-
-document_concept_matrix = np.matmul(sigma, U)
-latent_semantic_score = []
-
-for d in range(document_concept_matrix.shape[1]):
-    score = np.dot(document_concept_matrix[:, d], query)
-    score = score / (np.linalg.norm(document_concept_matrix[:, d]) * np.linalg.norm(query))
-    latent_semantic_score.append(score)
-
-print(latent_semantic_score)
-print("\nResults : \n")
-for i in np.argsort(latent_semantic_score)[::-1]:
-    print("Document {} : ".format(i), documents[i])
\ No newline at end of file
+# Driver Code
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "build":
+        if len(sys.argv) > 3:
+            A, words = ingest(sys.argv[3:])
+            index = index_from_matrix(A, words, CONCEPTS, backend = SVD_BACKEND, weighting = WEIGHTING, **VOCABULARY)
+        else:
+            index = build_index(documents, CONCEPTS, backend = SVD_BACKEND, weighting = WEIGHTING, **VOCABULARY)
+        index.save(sys.argv[2])
+        if len(sys.argv) > 3:
+            save_sources(sys.argv[2], sys.argv[3:])
+        if N_LISTS != 0:
+            IVFIndex.build(index, N_LISTS).save(sys.argv[2])
+        quit()
+    elif len(sys.argv) == 3 and sys.argv[1] == "query":
+        index = LSAIndex.load(sys.argv[2])
+        ann = IVFIndex.load(sys.argv[2])
+        sources = load_sources(sys.argv[2])
+    elif len(sys.argv) == 1:
+        index = build_index(documents, CONCEPTS, backend = SVD_BACKEND, weighting = WEIGHTING, **VOCABULARY)
+        ann = None
+        sources = None
+    else:
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 main.py [build index_dir [corpus files (one document per line)] | query index_dir]")
+        quit()
+
+    # search query
+
+    query = input("Query : ")
+    ranking, latent_semantic_score = score_queries(index, [query], top_k = index.n_documents, ann = ann, n_probe = N_PROBE)[0]
+
+    # scores in document order, like the original output (nan for documents the ANN search skipped)
+    scores = np.full(index.n_documents, np.nan)
+    scores[ranking] = latent_semantic_score
+    print(scores.tolist())
+    print("\nResults : \n")
+    for i in ranking:
+        if sources is not None:
+            print("Document {} : ".format(i), sources(i).strip())
+        else:
+            print("Document {} : ".format(i), documents[i])
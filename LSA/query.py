@@ -0,0 +1,112 @@
+# imports
+
+import numpy as np
+from scipy import sparse
+from corpus import tokenize
+
+
+# function definitions
+
+def query_matrix(index, queries):
+    """ Builds the concept vectors of a batch of queries
+
+        Every query vector is the average of the concept vectors of its known
+        terms, computed for the whole batch as one sparse product.  Unknown
+        terms are ignored; a query without any known term gets a zero vector.
+
+        Input:  index(LSAIndex), queries(list of strings or token lists)
+
+        Output: Q(queries x k array) """
+
+    tokens = [tokenize(q) if isinstance(q, str) else list(q) for q in queries]
+    qid = np.repeat(np.arange(len(tokens)), [len(t) for t in tokens])
+    rows = index.term_rows([t for q in tokens for t in q])
+
+    known = rows >= 0
+    qid, rows = qid[known], rows[known]
+    counts = np.bincount(qid, minlength = len(tokens))
+
+    M = sparse.csr_matrix((1 / counts[qid], (qid, rows)), shape = (len(tokens), index.n_terms))
+    return np.asarray(M @ index.term_concept_matrix)
+
+
+def score_queries(index, queries, top_k = 10, batch_size = 256, ann = None, n_probe = 8, cache = None):
+    """ Ranks the documents of index for a batch of queries by cosine similarity
+
+        All queries of a batch are scored against all documents with a single
+        matrix product and the precomputed document norms; the best top_k are
+        selected with argpartition and only those are sorted.
+
+        Input:  index(LSAIndex), queries(list of strings or token lists),
+                top_k(integer), batch_size(integer)
+
+                batch_size: number of queries scored per matrix product,
+                            bounds the batch_size x documents score matrix
+                ann:        optional IVFIndex built for index; only n_probe
+                            of its lists are searched instead of every document
+                cache:      optional QueryCache; only the queries it misses
+                            are scored, and their results are added to it
+
+        Output: list with one (documents, scores) pair of arrays per query,
+                best match first; empty for queries without known terms """
+
+    if cache is not None:
+        keys = [cache.key(q, top_k, None if ann is None else n_probe) for q in queries]
+        results = [None] * len(queries)
+        missing = dict()
+        for i, key in enumerate(keys):
+            if key in missing:
+                # a repeat within the batch is scored with its first occurrence
+                missing[key].append(i)
+                cache.hits += 1
+                continue
+            results[i] = cache.get(index, key)
+            if results[i] is None:
+                missing[key] = [i]
+
+        if missing:
+            first = [positions[0] for positions in missing.values()]
+            scored = score_queries(index, [queries[i] for i in first], top_k, batch_size, ann, n_probe)
+            for positions, result in zip(missing.values(), scored):
+                cache.put(index, keys[positions[0]], result)
+                for i in positions:
+                    results[i] = result
+
+        return results
+
+    results = []
+    top_k = min(top_k, index.n_documents)
+
+    if ann is not None:
+        for start in range(0, len(queries), batch_size):
+            Q = query_matrix(index, queries[start:start + batch_size])
+            results.extend(ann.search(index, Q, top_k, n_probe))
+        return results
+
+    doc_norms = np.asarray(index.document_norms)
+
+    for start in range(0, len(queries), batch_size):
+        Q = query_matrix(index, queries[start:start + batch_size])
+        q_norms = np.linalg.norm(Q, axis = 1)
+
+        denom = q_norms[:, None] * doc_norms[None, :]
+        scores = Q @ index.document_concept_matrix
+        np.divide(scores, denom, out = scores, where = denom > 0)
+        scores[denom == 0] = 0
+
+        if top_k < index.n_documents:
+            best = np.argpartition(-scores, top_k - 1, axis = 1)[:, :top_k]
+        else:
+            best = np.broadcast_to(np.arange(index.n_documents), scores.shape)
+        best_scores = np.take_along_axis(scores, best, axis = 1)
+        order = np.argsort(-best_scores, axis = 1, kind = "stable")
+        best = np.take_along_axis(best, order, axis = 1)
+        best_scores = np.take_along_axis(best_scores, order, axis = 1)
+
+        for i in range(len(Q)):
+            if q_norms[i] == 0:
+                results.append((best[i, :0], best_scores[i, :0]))
+            else:
+                results.append((best[i], best_scores[i]))
+
+    return results
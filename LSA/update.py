@@ -0,0 +1,186 @@
+# imports
+
+import uuid
+import numpy as np
+from scipy import sparse
+from corpus import term_document_matrix
+from index import LSAIndex
+from vocabulary import apply_weights, new_term_weight
+
+
+# class definitions
+
+class IncrementalLSA(object):
+    """ Grows an LSAIndex with new documents without a full decomposition
+
+        New documents (and the new terms they bring) are folded into the
+        current concept space immediately.  Every update_every documents the
+        folded-in columns are merged into the decomposition with a Brand
+        style rank k SVD update, which also places the new terms properly.
+
+        drift is the share of the added documents' weight that lies outside
+        the concept space they were projected on; when it gets large the
+        concepts no longer describe the corpus and a full rebuild is due.
+
+        Documents are weighted with the index's term weights; stop_words
+        should be the list the index was built with.  If the index has a
+        closed (pruned) vocabulary, terms outside it are ignored instead of
+        being added, and so are the hash rows pruning zeroed.
+
+        index() keeps the version of the LSAIndex it started from until
+        documents are added or merged, so query caches stay valid between
+        changes. """
+
+    def __init__(self, index, update_every = 1000, batch_size = 128, stop_words = None):
+        self.update_every = update_every
+        self.batch_size = batch_size
+        self.stop_words = stop_words
+
+        s = np.array(index.singular_values)
+        self.s = s
+        self.U = np.array(index.term_concept_matrix) / s
+        self.V = np.array(index.document_concept_matrix).T / s
+
+        self.words = list(index.vocabulary)
+        self.vocabulary = {term: i for i, term in enumerate(self.words)}
+
+        self.weighting = index.weighting
+        self.n_features = index.n_features
+        self.pruning = index.pruning
+        self.closed = index.closed_vocabulary
+        self.kept_rows = None if index.kept_rows is None else np.array(index.kept_rows)
+        self.term_weights = None if index.term_weights is None else np.array(index.term_weights)
+
+        self.n_base_terms = self.U.shape[0]
+        self.n_base_documents = self.V.shape[0]
+        self.pending = []
+
+        self.added_energy = 0.0
+        self.residual_energy = 0.0
+        self.version = index.version
+
+    @property
+    def drift(self):
+        """ Residual energy / total energy of the documents added since the
+            last full build, between 0 (fully explained) and 1 """
+
+        if self.added_energy == 0:
+            return 0.0
+        return self.residual_energy / self.added_energy
+
+    def rebuild_recommended(self, threshold = 0.25):
+        return self.drift > threshold
+
+    def add_documents(self, documents):
+        """ Folds documents into the concept space
+
+            Input:  documents(list of strings)
+
+            Output: array with the document numbers given to documents """
+
+        n_terms = self.U.shape[0]
+        vocabulary = dict(self.vocabulary) if self.closed else self.vocabulary
+        C, words = term_document_matrix(documents, vocabulary = vocabulary, dtype = self.U.dtype,
+                                        stop_words = self.stop_words, n_features = self.n_features)
+        if self.closed:
+            if self.kept_rows is not None:
+                C = sparse.diags(self.kept_rows.astype(C.dtype)) @ C
+            C = sparse.csc_matrix(C.tocsr()[:n_terms])
+            C.eliminate_zeros()
+        elif words is not None:
+            self.words.extend(words[n_terms:])
+
+        if self.weighting is not None:
+            weight = new_term_weight(self.weighting, self.V.shape[0])
+            self.term_weights = np.concatenate([self.term_weights, np.full(C.shape[0] - n_terms, weight)])
+            C = apply_weights(C, self.weighting, self.term_weights)
+
+        # documents: v = Σ^-1 U^T a, using the terms known so far
+        known = C[:n_terms]
+        L = np.asarray(known.T @ self.U).T
+        V_new = (L / self.s[:, None]).T
+
+        # new terms: u = t V Σ^-1, they only occur in the new documents
+        U_new = np.asarray(C[n_terms:] @ V_new) / self.s
+
+        energy = np.sum(C.data ** 2)
+        self.added_energy += energy
+        self.residual_energy += max(energy - np.sum(L ** 2), 0)
+
+        ids = np.arange(self.V.shape[0], self.V.shape[0] + C.shape[1])
+        self.U = np.vstack([self.U, U_new])
+        self.V = np.vstack([self.V, V_new])
+        self.pending.append(C)
+        self.version = uuid.uuid4().hex
+
+        if self.V.shape[0] - self.n_base_documents >= self.update_every:
+            self.update()
+
+        return ids
+
+    def update(self):
+        """ Merges all folded-in documents into the decomposition (Brand 2006)
+
+            The pending columns are processed batch_size at a time; the rank
+            stays at the number of concepts of the index. """
+
+        if not self.pending:
+            return
+
+        n_terms = self.U.shape[0]
+        k = len(self.s)
+        U = np.zeros((n_terms, k), dtype = self.U.dtype)
+        U[:self.n_base_terms] = self.U[:self.n_base_terms]
+        V = self.V[:self.n_base_documents]
+        s = self.s
+
+        C = sparse.hstack([sparse.csc_matrix((c.data, c.indices, c.indptr), shape = (n_terms, c.shape[1]))
+                           for c in self.pending]).tocsc()
+
+        for start in range(0, C.shape[1], self.batch_size):
+            U, s, V = brand_update(U, s, V, C[:, start:start + self.batch_size], k)
+
+        self.U, self.s, self.V = U, s, V
+        self.n_base_terms = n_terms
+        self.n_base_documents = V.shape[0]
+        self.pending = []
+        self.version = uuid.uuid4().hex
+
+    def index(self):
+        """ Returns the current state as an (in-memory) LSAIndex """
+
+        return LSAIndex(self.words, self.U * self.s, self.s, np.ascontiguousarray((self.V * self.s).T),
+                        version = self.version, term_weights = self.term_weights, weighting = self.weighting,
+                        n_features = self.n_features, pruning = self.pruning,
+                        kept_rows = self.kept_rows)
+
+
+# function definitions
+
+def brand_update(U, s, V, C, k):
+    """ Rank k SVD of [A C] from the rank k SVD A ~ U diag(s) V^T
+
+        Input:  U(terms x r), s(r), V(documents x r), C(terms x c, sparse),
+                k(integer)
+
+        Output: U(terms x k), s(k), V((documents + c) x k) """
+
+    r, c = len(s), C.shape[1]
+
+    L = np.asarray(C.T @ U).T
+    H = C.toarray() - U @ L
+    J, K = np.linalg.qr(H)
+
+    Q = np.zeros((r + c, r + c), dtype = U.dtype)
+    Q[:r, :r] = np.diag(s)
+    Q[:r, r:] = L
+    Q[r:, r:] = K
+
+    Uq, sq, Vqt = np.linalg.svd(Q)
+    k = min(k, r + c)
+    Vq = Vqt[:k].T
+
+    U = np.hstack([U, J]) @ Uq[:, :k]
+    V = np.vstack([V @ Vq[:r], Vq[r:]])
+
+    return U, sq[:k], V
@@ -0,0 +1,103 @@
+# imports
+
+import numpy as np
+from scipy import sparse
+
+ENGLISH_STOP_WORDS = frozenset("""
+    about above after again against all am an and any are as at be because been before being below between both
+    but by can could did do does doing down during each few for from further had has have having he her here hers
+    herself him himself his how if in into is it its itself just me more most my myself no nor not now of off on
+    once only or other our ours ourselves out over own same she should so some such than that the their theirs them
+    themselves then there these they this those through to too under until up very was we were what when where which
+    while who whom why will with would you your yours yourself yourselves
+    """.split())
+
+WEIGHTINGS = ("tfidf", "log_entropy")
+
+
+# function definitions
+
+def prune_vocabulary(A, words, min_df = 1, max_df = 1.0, max_features = None):
+    """ Drops rare, ubiquitous and surplus terms from a term-document matrix
+
+        Input:  A(sparse matrix, terms x documents), words(list or None),
+                min_df, max_df(integer document count or float fraction of
+                the documents), max_features(integer)
+
+                max_features:   keep only this many terms, those with the
+                                highest total count
+
+        Output: A and words restricted to the kept terms, in their original
+                order.  Hashed matrices (words is None) keep their shape,
+                the pruned rows are zeroed so term hashes stay valid. """
+
+    A = sparse.csc_matrix(A)
+    n_terms, n_documents = A.shape
+
+    df = np.bincount(A.indices, minlength = n_terms)
+    low = min_df if isinstance(min_df, (int, np.integer)) else int(np.ceil(min_df * n_documents))
+    high = max_df if isinstance(max_df, (int, np.integer)) else int(np.floor(max_df * n_documents))
+    keep = (df >= low) & (df <= high) & (df > 0)
+
+    if max_features is not None and keep.sum() > max_features:
+        totals = np.bincount(A.indices, weights = A.data, minlength = n_terms)
+        totals[~keep] = -1
+        ranked = np.argsort(-totals, kind = "stable")
+        keep[:] = False
+        keep[ranked[:max_features]] = True
+
+    if words is None:
+        A = sparse.diags(keep.astype(A.dtype)) @ A
+        A.eliminate_zeros()
+        return A.tocsc(), None
+
+    rows = np.flatnonzero(keep)
+    return A.tocsr()[rows].tocsc(), [words[i] for i in rows]
+
+
+def weight_matrix(A, scheme):
+    """ Applies a term weighting to the nonzeros of A
+
+        Input:  A(sparse matrix, terms x documents), scheme(string)
+
+                "tfidf":        tf * (ln((1 + D) / (1 + df)) + 1)
+                "log_entropy":  ln(1 + tf) * (1 + sum_j p_ij ln(p_ij) / ln(D)),
+                                p_ij = tf_ij / (total count of term i)
+
+        Output: weighted A and the global weight of every term """
+
+    A = sparse.csc_matrix(A, dtype = np.float64 if A.dtype.kind != "f" else A.dtype)
+    n_terms, n_documents = A.shape
+
+    if scheme == "tfidf":
+        df = np.bincount(A.indices, minlength = n_terms)
+        global_weights = np.log((1 + n_documents) / (1 + df)) + 1
+    elif scheme == "log_entropy":
+        totals = np.bincount(A.indices, weights = A.data, minlength = n_terms)
+        p = A.data / totals[A.indices]
+        entropy = np.bincount(A.indices, weights = p * np.log(p), minlength = n_terms)
+        global_weights = 1 + entropy / np.log(n_documents) if n_documents > 1 else np.ones(n_terms)
+    else:
+        raise ValueError("Unknown weighting {!r}, use one of {}".format(scheme, WEIGHTINGS))
+
+    return apply_weights(A, scheme, global_weights), global_weights.astype(A.dtype)
+
+
+def apply_weights(A, scheme, global_weights):
+    """ Weights new columns (e.g. folded-in documents) like the index they
+        are added to; global_weights must cover every row of A """
+
+    A = sparse.csc_matrix(A, copy = True)
+    if scheme == "log_entropy":
+        A.data = np.log1p(A.data)
+    A.data *= global_weights[A.indices]
+    return A
+
+
+def new_term_weight(scheme, n_documents):
+    """ Global weight for a term first seen after the weights were computed,
+        the weight of a term occurring in a single document """
+
+    if scheme == "tfidf":
+        return np.log((1 + n_documents) / 2) + 1
+    return 1.0
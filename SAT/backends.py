@@ -0,0 +1,68 @@
+# imports
+
+from functools import partial
+from psat import sat_solver
+from dll_gsat import gsat, dll, cdcl
+
+
+# function definitions
+
+def _lists(clauses):
+    # preprocessed formulas are lists of clauses of mixed widths
+    return clauses.tolist() if hasattr(clauses, "tolist") else clauses
+
+
+def pysat_solver(clauses, n, seconds = None, conflicts = None, flips = None, stats = None, reuse = False,
+                 name = "glucose3"):
+    return sat_solver(clauses, seconds, conflicts, reuse, name, stats)[0]
+
+
+def local_search(clauses, n, seconds = None, conflicts = None, flips = None, stats = None, strategy = "gsat"):
+    # 7n flips per restart and 2n restarts, the limits of the original gsat driver
+    return gsat(_lists(clauses), 7*n, 2*n, n, strategy, seconds = seconds, flips = flips, stats = stats)
+
+
+def dpll(clauses, n, seconds = None, conflicts = None, flips = None, stats = None):
+    return dll(_lists(clauses), n, seconds, conflicts, stats)
+
+
+def cdcl_solver(clauses, n, seconds = None, conflicts = None, flips = None, stats = None):
+    return cdcl(_lists(clauses), n, seconds, conflicts, stats)
+
+
+# can only prove satisfiability, False from them is not UNSAT
+INCOMPLETE = ("gsat", "walksat", "probsat")
+
+BACKENDS = {
+    "glucose3": pysat_solver,
+    "glucose3_reuse": partial(pysat_solver, reuse = True),
+    "glucose4": partial(pysat_solver, name = "glucose4"),
+    "minisat22": partial(pysat_solver, name = "minisat22"),
+    "maplesat": partial(pysat_solver, name = "maplesat"),
+    "gsat": partial(local_search, strategy = "gsat"),
+    "walksat": partial(local_search, strategy = "walksat"),
+    "probsat": partial(local_search, strategy = "probsat"),
+    "dll": dpll,
+    "cdcl": cdcl_solver,
+}
+
+
+def solve(backend, clauses, n, seconds = None, conflicts = None, flips = None, stats = None):
+    """ Runs a backend by name on an (m, k) clause array (or a list of
+        clauses)
+
+        Input:  backend(string), clauses, n(integer), seconds(float),
+                conflicts(integer), flips(integer), stats(stats.SearchStats)
+
+                seconds:    wall clock budget of the instance
+                conflicts:  conflict budget (glucose3, dll, cdcl)
+                flips:      flip budget (local search)
+                stats:      filled with the search statistics of the run
+
+        Output: True if satisfiable, False if not, None (unknown) if a
+                budget ran out.  Local search backends can not prove
+                unsatisfiability, False means that no model was found. """
+
+    if backend not in BACKENDS:
+        raise ValueError("Unknown backend {!r}, use one of {}".format(backend, ", ".join(BACKENDS)))
+    return BACKENDS[backend](clauses, n, seconds, conflicts, flips, stats)
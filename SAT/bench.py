@@ -0,0 +1,249 @@
+# imports
+
+import sys
+import json
+import platform
+from time import perf_counter
+import numpy as np
+import pysat
+from backends import BACKENDS, INCOMPLETE
+from sweep import WorkerPool, available_cores, run_config, run_task, sweep
+from results import ResultLog
+from instances import ratio_grid, imported_points
+from plot import plot
+from stats import COUNTERS, aggregate
+
+# per instance budgets, None for no limit; instances that exceed them are UNKNOWN
+TIME_BUDGET = 60.0          # seconds
+CONFLICT_BUDGET = None      # pysat solvers, dll, cdcl
+FLIP_BUDGET = None          # local search
+RESULT_LOG = "results.jsonl"    # sweeps continue from the instances already in it
+COLLECT_STATS = False       # search statistics of every instance, logged and aggregated per ratio
+PREPROCESS = False          # simplify every instance with preprocess.py before the backend runs
+
+
+# function definitions
+
+def latency(seconds):
+    """ p50 / p95 / p99 / mean / max of per instance times, in seconds """
+
+    if not len(seconds):
+        return {}
+    p50, p95, p99 = np.percentile(seconds, [50, 95, 99])
+    return {"p50": p50, "p95": p95, "p99": p99, "mean": float(np.mean(seconds)), "max": float(np.max(seconds))}
+
+
+def run_bench(backends, ks, ns, samples, ratios = None, processes = None, corpus = None,
+              seconds = None, conflicts = None, flips = None, log = None, collect_stats = False,
+              simplify = False, points = None, names = None):
+    """ Runs several backends on identical instance streams
+
+        Input:  backends(list of names in backends.BACKENDS), ks, ns(lists
+                of integers), samples(integer), ratios(list of m/n floats),
+                processes(integer), corpus(path), seconds, conflicts,
+                flips(per instance budgets), log(path of a results.ResultLog),
+                collect_stats(boolean, aggregated per grid point),
+                simplify(boolean, preprocess every instance)
+
+                ratios:     instances.ratio_grid(n) / n by default
+                points:     (k, n, m, seed) list to run instead of the grid,
+                            e.g. instances.imported_points(corpus)
+                names:      seed -> instance name; the report then also
+                            lists the result of every named instance
+
+        Every backend solves instances (k, n, round(ratio*n), seed) for
+        seeds 0 .. samples - 1 over the whole grid, so all of them see the
+        same formulas.  The backends run one after the other on the same
+        process pool; throughput is instances per wall clock second of a
+        backend's whole run.  Instances already in the log under the same
+        run configuration (sweep.run_config) are not solved again (and do
+        not count toward the throughput).
+
+        Output: report dict with per backend latency percentiles,
+                throughput, result counts and a per grid point breakdown,
+                plus the instances on which a backend contradicted a
+                complete one """
+
+    processes = processes or available_cores()
+    budget = {"seconds": seconds, "conflicts": conflicts, "flips": flips, "stats": collect_stats,
+              "preprocess": simplify}
+    config = run_config(budget, processes, corpus)
+    if points is None:
+        grid = [(k, n, m) for k in ks for n in ns
+                for m in (ratio_grid(n) if ratios is None else sorted(set(int(round(r*n)) for r in ratios)))]
+        points = [(k, n, m, seed) for k, n, m in grid for seed in range(samples)]
+    else:
+        grid = sorted(set((k, n, m) for k, n, m, seed in points))
+
+    results = ResultLog(log) if log else None
+    records = {b: [] for b in backends}
+    wall = dict()
+
+    def killed(task):
+        backend, corpus, k, n, m, seed, budget = task
+        return {"k": k, "n": n, "m": m, "seed": seed, "backend": backend, "result": None,
+                "seconds": 2*seconds + 5, "killed": True, "config": config}
+
+    try:
+        with WorkerPool(run_task, processes, None if seconds is None else 2*seconds + 5, killed) as workers:
+            for backend in backends:
+                tasks = []
+                for k, n, m, seed in points:
+                    done = results and results.get(k, n, m, seed, backend, config)
+                    if done:
+                        records[backend].append(done)
+                    else:
+                        tasks.append((backend, corpus, k, n, m, seed, budget))
+
+                start = perf_counter()
+                for r in workers.imap_unordered(tasks, max(1, len(tasks) // (4 * processes))):
+                    r["config"] = config
+                    records[backend].append(r)
+                    if results:
+                        results.append(r)
+                wall[backend] = (perf_counter() - start, len(tasks))
+    finally:
+        if results:
+            results.close()
+
+    report = {
+        "config": {
+            "backends": backends,
+            "k": ks,
+            "n": ns,
+            "samples": samples,
+            "grid_points": len(grid),
+            "instances": len(points),
+            "processes": processes,
+            "budget": budget,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pysat": pysat.__version__,
+            "machine": platform.machine(),
+        },
+        "backends": dict(),
+        "disagreements": disagreements(records),
+    }
+
+    for backend, rs in records.items():
+        run_seconds, solved = wall[backend]
+        by_point = dict()
+        for r in rs:
+            by_point.setdefault((r["k"], r["n"], r["m"]), []).append(r)
+
+        report["backends"][backend] = {
+            "instances": len(rs),
+            "wall_seconds": run_seconds,
+            "throughput": solved / run_seconds if solved else None,
+            "latency": latency([r["seconds"] for r in rs]),
+            "results": counts(rs),
+            "stats": aggregate(r.get("stats") for r in rs),
+            "grid": [dict(k = k, n = n, m = m, ratio = m / n if n else None, latency = latency([r["seconds"] for r in by_point[k, n, m]]),
+                          stats = aggregate(r.get("stats") for r in by_point[k, n, m]),
+                          **counts(by_point[k, n, m])) for k, n, m in sorted(by_point)],
+        }
+        if names:
+            report["backends"][backend]["named"] = {names[r["seed"]]: {"result": r["result"], "seconds": r["seconds"]}
+                                                    for r in rs if r["seed"] in names}
+
+    return report
+
+
+def counts(records):
+    return {"sat": sum(r["result"] is True for r in records),
+            "unsat": sum(r["result"] is False for r in records),
+            "unknown": sum(r["result"] is None for r in records)}
+
+
+def disagreements(records):
+    """ Instances that one backend found satisfiable and a complete backend
+        proved unsatisfiable (local search False only means no model) """
+
+    answers = dict()
+    for backend, rs in records.items():
+        for r in rs:
+            answers.setdefault((r["k"], r["n"], r["m"], r["seed"]), dict())[backend] = r["result"]
+
+    found = []
+    for (k, n, m, seed), by_backend in sorted(answers.items()):
+        sat = [b for b, result in by_backend.items() if result is True]
+        unsat = [b for b, result in by_backend.items() if result is False and b not in INCOMPLETE]
+        if sat and unsat:
+            found.append({"k": k, "n": n, "m": m, "seed": seed, "sat": sat, "unsat": unsat})
+    return found
+
+
+def sweep_driver(backend, args, processes = None, script = "main.py"):
+    """ The phase transition sweep the driver scripts run
+
+        Input:  backend(string), args(command line: literal_per_clause
+                unique_literals max_iterations_for_probability [corpus_dir]),
+                processes(integer, all cores by default), script(name for
+                the usage message) """
+
+    if len(args) not in (3, 4) or backend not in BACKENDS:
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 {} literal_per_clause unique_literals max_iterations_for_probability [corpus_dir]".format(script))
+        print("Backends: " + ", ".join(BACKENDS))
+        quit()
+
+    k, n, j = [int(i) for i in args[:3]]
+    corpus = args[3] if len(args) == 4 else None
+
+    def progress(m, entry):
+        if entry["stats"]:
+            mean = entry["stats"]["mean"]
+            print(m/n, entry["samples"], entry["unknown"], " ".join("{}={:.1f}".format(name, mean[name]) for name in COUNTERS))
+        else:
+            print(m/n, entry["samples"], entry["unknown"])
+
+    sweep(backend, k, n, j, processes = processes, corpus = corpus, seconds = TIME_BUDGET,
+          conflicts = CONFLICT_BUDGET, flips = FLIP_BUDGET, log = RESULT_LOG,
+          collect_stats = COLLECT_STATS, simplify = PREPROCESS, progress = progress)
+
+    budget = {"seconds": TIME_BUDGET, "conflicts": CONFLICT_BUDGET, "flips": FLIP_BUDGET, "stats": COLLECT_STATS,
+              "preprocess": PREPROCESS}
+    plot(RESULT_LOG, "Out.png", backend, k, n, run_config(budget, processes or available_cores(), corpus))
+
+
+# Driver Code
+if __name__ == "__main__":
+    budgets = dict(seconds = TIME_BUDGET, conflicts = CONFLICT_BUDGET, flips = FLIP_BUDGET, log = RESULT_LOG,
+                   collect_stats = COLLECT_STATS, simplify = PREPROCESS)
+
+    if len(sys.argv) == 5 and sys.argv[1] == "corpus":
+        # every imported (DIMACS) instance of a corpus
+        points, names = imported_points(sys.argv[2])
+        backends = sys.argv[3].split(",")
+        output = sys.argv[4]
+        report = run_bench(backends, [], [], 0, corpus = sys.argv[2], points = points, names = names, **budgets)
+    elif len(sys.argv) in (6, 7):
+        backends = sys.argv[1].split(",")
+        ks = [int(i) for i in sys.argv[2].split(",")]
+        ns = [int(i) for i in sys.argv[3].split(",")]
+        samples = int(sys.argv[4])
+        ratios = [float(r) for r in sys.argv[6].split(",")] if len(sys.argv) == 7 else None
+        output = sys.argv[5]
+        report = run_bench(backends, ks, ns, samples, ratios, **budgets)
+    else:
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 bench.py backend,... k,... n,... samples output.json [ratio,...]")
+        print("                python3 bench.py corpus corpus_dir backend,... output.json")
+        print("Example:        python3 bench.py glucose3,cdcl,dll 3 50,100 20 bench.json 3,4.26,5")
+        print("Backends: " + ", ".join(BACKENDS))
+        quit()
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent = 1, sort_keys = True, default = float)
+
+    print("{:16} {:>9} {:>10} {:>10} {:>10} {:>12}".format("backend", "instances", "p50 ms", "p95 ms", "p99 ms", "instances/s"))
+    for backend, values in report["backends"].items():
+        lat = values["latency"]
+        if not lat:
+            continue
+        print("{:16} {:9d} {:10.3f} {:10.3f} {:10.3f} {:12.1f}".format(backend, values["instances"], lat["p50"] * 1000,
+              lat["p95"] * 1000, lat["p99"] * 1000, values["throughput"] or 0.0))
+    if report["disagreements"]:
+        print("{} instances with contradicting answers, see {}".format(len(report["disagreements"]), output))
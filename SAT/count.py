@@ -0,0 +1,381 @@
+# imports
+
+import sys
+from math import log2
+from time import perf_counter
+from collections import OrderedDict
+from generator import instance
+from sweep import WorkerPool
+
+
+# class definitions
+
+class ComponentCache(object):
+    """ Bounded LRU cache of component model counts
+
+        A component is keyed on its canonical encoding, the sorted tuple of
+        its clauses with sorted literals.  Variables keep their numbers, so
+        the same residual component reached under different partial
+        assignments shares one entry.
+
+        Input:  maxsize(integer, maximum number of cached components) """
+
+    def __init__(self, maxsize = 100000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.merged = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, clauses):
+        return tuple(sorted(clauses))
+
+    def get(self, key):
+        """ Returns the cached count for key, or None """
+
+        count = self.entries.get(key)
+
+        if count is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return count
+
+    def put(self, key, count):
+        self.entries[key] = count
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last = False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def merge(self, stats):
+        """ Adds the lookups of another cache, e.g. a pool worker's, to the
+            counters (its entries stay where they are) """
+
+        self.hits += stats["hits"]
+        self.misses += stats["misses"]
+        self.evictions += stats["evictions"]
+        self.merged += stats["entries"]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries) + self.merged,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class ModelCounter(object):
+    """ #SAT: counts the models of a formula with a DPLL search over the
+        whole tree
+
+        Every node branches on the variable with the most occurrences (as
+        dll does), assigns it both ways and unit propagates.  The residual
+        formula is split into connected components (groups of clauses that
+        share no variable), which are counted on their own and multiplied;
+        variables that drop out of the formula unassigned are free and
+        double the count.  Component counts are memoized in a
+        ComponentCache, without it counting is exponential even on easy
+        instances.
+
+        Sizes in scope: the search is still exponential, the time grows
+        fastest below the threshold where there are many models.  Within
+        the 60 s bench budget on random 3-SAT that is about n = 50 at
+        m/n = 1.5, n = 60 at m/n = 2 and n = 80 at m/n = 3, while near and
+        above the threshold (m/n >= 3.5) n = 100 to 150 counts in seconds;
+        n = 100 at m/n = 1.5 is out of reach.  The search depth is bounded
+        by n but lives on an explicit stack, so no size hits the recursion
+        limit.
+
+        Input:  clauses(2D int array or list of clauses), n(integer, max
+                literal of the clauses by default), cache(ComponentCache,
+                a new one of maxsize entries by default), maxsize(integer) """
+
+    def __init__(self, clauses, n = None, cache = None, maxsize = 100000):
+        self.clauses = []
+        self.empty = False
+        for clause in clauses:
+            clause = tuple(sorted(set(int(l) for l in clause)))
+            if not clause:
+                self.empty = True
+            elif not any(-l in clause for l in clause):
+                self.clauses.append(clause)
+
+        if n is None:
+            n = max((abs(l) for clause in self.clauses for l in clause), default = 0)
+        self.n = n
+        self.cache = cache if cache is not None else ComponentCache(maxsize)
+        self.deadline = None
+        self.stats = None
+
+    def start(self, seconds = None, stats = None):
+        self.deadline = None if seconds is None else perf_counter() + seconds
+        self.stats = stats
+
+    def count(self, seconds = None, stats = None, processes = 1):
+        """ Number of models over the variables 1 .. n
+
+            Input:  seconds(float), stats(stats.SearchStats),
+                    processes(integer)
+
+                    processes:  with more than one, the components of the
+                                formula after top level propagation are
+                                counted on a process pool (every worker with
+                                its own cache, whose lookups are merged into
+                                this cache's counters; stats only cover the
+                                work done in this process)
+
+            Output: integer, None if the time budget ran out """
+
+        self.start(seconds, stats)
+        if self.empty:
+            return 0
+        simplified = simplify(self.clauses, ())
+        if simplified is None:
+            return 0
+        residual, assigned = simplified
+        if stats is not None:
+            stats.propagations += len(assigned)
+
+        parts = components(residual)
+        free = self.n - len(assigned) - sum(len(variables(part)) for part in parts)
+
+        if processes > 1 and len(parts) > 1:
+            tasks = [(part, seconds, self.cache.maxsize) for part in parts]
+            counts = []
+            with WorkerPool(_count_component, min(processes, len(parts))) as workers:
+                for c, cache_stats in workers.imap_unordered(tasks):
+                    counts.append(c)
+                    self.cache.merge(cache_stats)
+        else:
+            counts = []
+            for part in parts:
+                counts.append(self.count_component(part))
+                if counts[-1] is None:
+                    break
+
+        if None in counts:
+            return None
+        total = 2**free
+        for c in counts:
+            total *= c
+        return total
+
+    def count_component(self, clauses):
+        """ Models of one connected component over its own variables, None
+            if the time budget ran out
+
+            The search keeps its own stack of frames, one per component
+            being expanded, rather than recursing per decision: a frame
+            holds the component's cache key, the literals still to branch
+            on, the total so far, the product of the branch in progress and
+            the sub-components of that branch not yet multiplied in. """
+
+        cached = self.lookup(clauses)
+        if cached is not None:
+            return cached
+        if self.deadline is not None and perf_counter() > self.deadline:
+            return None
+
+        stats = self.stats
+        stack = [self.frame(clauses)]
+        while True:
+            frame = stack[-1]
+
+            if frame["parts"] and frame["product"] != 0:
+                part = frame["parts"].pop()
+                c = self.lookup(part)
+                if c is not None:
+                    frame["product"] *= c
+                    continue
+                if self.deadline is not None and perf_counter() > self.deadline:
+                    return None
+                stack.append(self.frame(part))
+                continue
+
+            # the branch in progress is complete
+            if frame["product"] is not None:
+                frame["total"] += frame["product"]
+                frame["product"] = None
+                frame["parts"] = []
+
+            if frame["literals"]:
+                literal = frame["literals"].pop()
+                if stats is not None:
+                    stats.decisions += 1
+                    stats.depth(len(stack))
+
+                simplified = simplify(frame["clauses"], (literal,))
+                if simplified is None:
+                    if stats is not None:
+                        stats.conflicts += 1
+                        stats.backtracks += 1
+                        stats.tick()
+                    continue
+                residual, assigned = simplified
+                if stats is not None:
+                    stats.propagations += len(assigned) - 1
+
+                parts = components(residual)
+                frame["product"] = 2**(frame["n"] - len(assigned) - sum(len(variables(part)) for part in parts))
+                frame["parts"] = parts
+                continue
+
+            self.cache.put(frame["key"], frame["total"])
+            stack.pop()
+            if not stack:
+                return frame["total"]
+            stack[-1]["product"] *= frame["total"]
+
+    def lookup(self, clauses):
+        """ Count of a component that needs no search (a single clause or a
+            cache hit), None otherwise """
+
+        if len(clauses) == 1:
+            return 2**len(clauses[0]) - 1
+        return self.cache.get(self.cache.key(clauses))
+
+    def frame(self, clauses):
+        """ Search frame of a component, branching on the variable with the
+            most occurrences, positive literal first """
+
+        occurrences = dict()
+        for clause in clauses:
+            for l in clause:
+                occurrences[abs(l)] = occurrences.get(abs(l), 0) + 1
+        v = max(occurrences, key = occurrences.get)
+
+        return {
+            "clauses": clauses,
+            "key": self.cache.key(clauses),
+            "n": len(occurrences),
+            "literals": [-v, v],
+            "total": 0,
+            "product": None,
+            "parts": [],
+        }
+
+
+# function definitions
+
+def variables(clauses):
+    return set(abs(l) for clause in clauses for l in clause)
+
+
+def simplify(clauses, literals):
+    """ Assigns literals and unit propagates
+
+        Input:  clauses(list of tuples of sorted literals), literals(iterable)
+
+        Output: (residual clauses, set of assigned literals), None on a
+                conflict """
+
+    occurrences = dict()
+    for ci, clause in enumerate(clauses):
+        for l in clause:
+            occurrences.setdefault(l, []).append(ci)
+
+    assigned = set()
+    queue = list(literals)
+    while queue:
+        literal = queue.pop()
+        if literal in assigned:
+            continue
+        if -literal in assigned:
+            return None
+        assigned.add(literal)
+
+        # only the clauses that lost a literal can become unit or empty
+        for ci in occurrences.get(-literal, ()):
+            clause = clauses[ci]
+            if any(l in assigned for l in clause):
+                continue
+            rest = [l for l in clause if -l not in assigned]
+            if not rest:
+                return None
+            if len(rest) == 1:
+                queue.append(rest[0])
+
+    residual = []
+    for clause in clauses:
+        if not any(l in assigned for l in clause):
+            residual.append(tuple(l for l in clause if -l not in assigned))
+    return residual, assigned
+
+
+def components(clauses):
+    """ Splits clauses into groups that share no variable (union find over
+        the variables) """
+
+    parent = dict()
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for clause in clauses:
+        root = find(parent.setdefault(abs(clause[0]), abs(clause[0])))
+        for l in clause[1:]:
+            other = find(parent.setdefault(abs(l), abs(l)))
+            if other != root:
+                parent[other] = root
+
+    groups = dict()
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return list(groups.values())
+
+
+def _count_component(task):
+    clauses, seconds, maxsize = task
+    counter = ModelCounter([], maxsize = maxsize)
+    counter.start(seconds)
+    return counter.count_component(clauses), counter.cache.stats()
+
+
+def count(clauses, n = None, seconds = None, stats = None, processes = 1, maxsize = 100000):
+    """ Number of models of clauses over the variables 1 .. n, None if the
+        time budget ran out, see ModelCounter """
+
+    return ModelCounter(clauses, n, maxsize = maxsize).count(seconds, stats, processes)
+
+
+# Driver Code
+if __name__ == "__main__":
+    from bench import TIME_BUDGET
+
+    if len(sys.argv) not in (5, 6):
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 count.py literal_per_clause unique_literals clauses instances [processes]")
+        quit()
+
+    k, n, m, cases = [int(i) for i in sys.argv[1:5]]
+    processes = int(sys.argv[5]) if len(sys.argv) == 6 else 1
+
+    print("{:6} {:>24} {:>10} {:>10} {:>9}".format("seed", "models", "log2/n", "seconds", "hit rate"))
+    for seed in range(cases):
+        counter = ModelCounter(instance(k, m, n, seed), n)
+        start = perf_counter()
+        models = counter.count(TIME_BUDGET, processes = processes)
+        elapsed = perf_counter() - start
+        if models is None:
+            print("{:6d} {:>24} {:>10} {:10.3f} {:9.2f}".format(seed, "unknown", "-", elapsed, counter.cache.stats()["hit_rate"]))
+        else:
+            density = log2(models) / n if models else float("-inf")
+            print("{:6d} {:24d} {:10.4f} {:10.3f} {:9.2f}".format(seed, models, density, elapsed, counter.cache.stats()["hit_rate"]))
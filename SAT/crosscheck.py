@@ -0,0 +1,104 @@
+# imports
+
+import sys
+import itertools
+from random import Random
+from pysat.solvers import Solver
+from dll_gsat import dll, cdcl
+from preprocess import preprocess
+from count import count
+
+
+# function definitions
+
+def random_formula(rng, n, m, max_width = 3):
+    """ m random clauses of 1 .. max_width literals over n variables, now
+        and then with an empty clause or a repeated literal """
+
+    clauses = []
+    for i in range(m):
+        width = 0 if rng.random() < 0.01 else rng.randint(1, max_width)
+        clauses.append([rng.choice((-1, 1)) * rng.randint(1, n) for j in range(width)])
+    return clauses
+
+
+def reference(clauses):
+    """ Satisfiability according to Glucose3 """
+
+    if any(len(clause) == 0 for clause in clauses):
+        return False
+    with Solver(name = "glucose3", bootstrap_with = clauses) as s:
+        return s.solve()
+
+
+def brute_force(clauses, n):
+    """ Number of models over variables 1 .. n by enumeration """
+
+    return sum(all(any(model[abs(l) - 1] == (l > 0) for l in clause) for clause in clauses)
+               for model in itertools.product((False, True), repeat = n))
+
+
+def satisfied(clauses, model):
+    return all(any(model[abs(l) - 1] == (l > 0) for l in clause) for clause in clauses)
+
+
+def crosscheck(instances, seed = 0, max_n = 12):
+    """ Compares dll, cdcl and preprocessing against Glucose3 and count
+        against enumeration on random formulas of up to max_n variables
+
+        Input:  instances(integer), seed(integer), max_n(integer, brute
+                force counting is 2^max_n per formula)
+
+        Output: list of (check, clauses, n) that disagreed, empty if all
+                checks passed """
+
+    rng = Random(seed)
+    failures = []
+
+    for i in range(instances):
+        n = rng.randint(1, max_n)
+        clauses = random_formula(rng, n, rng.randint(0, 5*n))
+        expected = reference(clauses)
+
+        if dll(clauses, n) != expected:
+            failures.append(("dll", clauses, n))
+        if cdcl(clauses, n) != expected:
+            failures.append(("cdcl", clauses, n))
+
+        # the simplified formula must agree, and extend() must turn its
+        # models into models of the original formula
+        p, ok = preprocess(clauses, n)
+        if not ok:
+            if expected:
+                failures.append(("preprocess", clauses, n))
+        else:
+            with Solver(name = "glucose3", bootstrap_with = p.result()) as s:
+                if s.solve() != expected:
+                    failures.append(("preprocess", clauses, n))
+                elif expected:
+                    values = set(l for l in s.get_model() or ())
+                    model = p.extend([v in values for v in range(1, n + 1)])
+                    if not satisfied(clauses, model):
+                        failures.append(("extend", clauses, n))
+
+        if count(clauses, n) != brute_force(clauses, n):
+            failures.append(("count", clauses, n))
+
+    return failures
+
+
+# Driver Code
+if __name__ == "__main__":
+    if len(sys.argv) not in (1, 2, 3):
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 crosscheck.py [instances [seed]]")
+        quit()
+
+    instances = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    failures = crosscheck(instances, seed)
+    for check, clauses, n in failures:
+        print("{:10} n={} {}".format(check, n, clauses))
+    print("{} instances, {} disagreements".format(instances, len(failures)))
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,103 @@
+# imports
+
+import gzip
+import numpy as np
+
+
+# function definitions
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t")
+    return open(path, mode)
+
+
+def iter_clauses(source, header = None):
+    """ Streams the clauses of a DIMACS CNF file
+
+        Input:  source(path, optionally .gz, or an open text file),
+                header(dict, optional)
+
+                header: filled with n and m from the "p cnf n m" line
+
+        Output: generator of clauses, each a list of signed ints; clauses
+                may span several lines, "c" lines are comments and a "%"
+                line ends the formula (as in the SATLIB files) """
+
+    f = _open(source, "r") if isinstance(source, str) else source
+    clause = []
+
+    try:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == "c":
+                continue
+            if line[0] == "%":
+                break
+            if line[0] == "p":
+                fields = line.split()
+                if len(fields) != 4 or fields[1] != "cnf":
+                    raise ValueError("Bad DIMACS problem line: {!r}".format(line))
+                if header is not None:
+                    header["n"], header["m"] = int(fields[2]), int(fields[3])
+                continue
+
+            for token in line.split():
+                literal = int(token)
+                if literal == 0:
+                    yield clause
+                    clause = []
+                else:
+                    clause.append(literal)
+    finally:
+        if f is not source:
+            f.close()
+
+    if clause:
+        yield clause
+
+
+def read_dimacs(source):
+    """ Reads a whole DIMACS CNF file
+
+        Output: n(number of variables) and the list of clauses """
+
+    header = dict()
+    clauses = list(iter_clauses(source, header))
+    n = header.get("n", max((abs(l) for c in clauses for l in c), default = 0))
+    return n, clauses
+
+
+def write_dimacs(dest, clauses, n = None, comments = ()):
+    """ Writes clauses in DIMACS CNF format
+
+        Input:  dest(path, optionally .gz, or an open text file),
+                clauses(2D int array or iterable of clauses), n(integer),
+                comments(list of strings)
+
+                n:  number of variables, taken from the clauses if None
+
+        Fixed width clause arrays are written with one vectorized format
+        call; other clause iterables are streamed line by line. """
+
+    if not isinstance(clauses, np.ndarray) or clauses.ndim != 2:
+        clauses = list(clauses)
+    if n is None:
+        n = max((abs(int(l)) for c in clauses for l in c), default = 0)
+
+    f = _open(dest, "w") if isinstance(dest, str) else dest
+
+    try:
+        for comment in comments:
+            f.write("c {}\n".format(comment))
+        f.write("p cnf {} {}\n".format(n, len(clauses)))
+
+        if isinstance(clauses, np.ndarray):
+            rows = np.hstack([clauses, np.zeros((len(clauses), 1), dtype = clauses.dtype)])
+            np.savetxt(f, rows, fmt = "%d")
+        else:
+            for clause in clauses:
+                f.write(" ".join(map(str, clause)) + " 0\n")
+    finally:
+        if f is not dest:
+            f.close()
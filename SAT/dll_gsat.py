@@ -1,146 +1,746 @@
 # imports
 
-from random import sample, choice
+from random import Random
+from heapq import heappush, heappop, heapify
+from time import perf_counter
 from sys import argv
-from multiprocessing import Pool
-from time import time
-from functools import reduce
-from matplotlib import pyplot as plt
-from copy import deepcopy
+import numpy as np
+from evaluate import clause_matrix, true_literals, true_counts, satisfies
 
 # func defs
 
-def cnf(k, m, n):
-    unique_literals = [i for i in range(1, n+1)]
-    clauses = []
-
-    for i in range(m):
-        s = sample(unique_literals, k)
-        s = list(map(lambda l: choice([1, -1]) * l, s))
-        clauses.append(s)
-
-    return clauses
-
-
 # GSAT --------------------------------------------------------------------------------------------
 
-def gsat(clauses, max_flips, max_restarts, n):
-    
-    for i in range(max_restarts):
-
-        # create a random model
-        model = [choice([True, False]) for i in range(1, n+1)]
-
-        if resolve(clauses, model):
+class LocalSearch(object):
+    """ GSAT / WalkSAT / ProbSAT over incrementally maintained scores
+
+        Per clause the number of true literals (and the sum of their
+        variables, which names the only true variable when the count is 1)
+        is kept, per variable break (clauses that become false if it flips)
+        and score = make - break.  A flip only visits the clauses in which
+        the flipped variable occurs; gsat keeps the scores in a lazy max
+        heap (stale entries are dropped when they reach the top), so
+        picking the best variable does not scan all of them.
+
+        strategy:   "gsat"      flip the variable with the best score (the
+                                first one on ties, like the old optimal_flip)
+                    "walksat"   pick an unsatisfied clause, flip a variable
+                                with break 0 if there is one, else with
+                                probability noise a random one of the clause,
+                                else the one with the smallest break
+                    "probsat"   pick an unsatisfied clause, flip one of its
+                                variables with probability ~ (eps + break)^-cb """
+
+    def __init__(self, clauses, n, seed = None, strategy = "gsat", noise = 0.5, cb = 2.06, eps = 0.9):
+        if strategy not in ("gsat", "walksat", "probsat"):
+            raise ValueError("Unknown local search strategy {!r}".format(strategy))
+
+        self.n = n
+        self.rng = Random(seed)
+        self.strategy = strategy
+        self.noise = noise
+        self.cb = cb
+        self.eps = eps
+
+        self.clauses = []
+        self.empty = False
+        for clause in clauses:
+            clause = list(dict.fromkeys(int(l) for l in clause))
+            if not clause:
+                self.empty = True
+            elif not any(-l in clause for l in clause):
+                self.clauses.append(clause)
+        self.variables = [[abs(l) for l in clause] for clause in self.clauses]
+        self.matrix = clause_matrix(self.clauses)
+        self.generator = np.random.default_rng(seed)
+
+        self.occurrences = [[] for i in range(2*n + 1)]
+        for ci, clause in enumerate(self.clauses):
+            for l in clause:
+                self.occurrences[l + n].append(ci)
+
+    def restart(self, model = None, counts = None):
+        """ Sets a (random) model, model[v - 1] is the value of variable v;
+            counts are its true literals per clause if already evaluated """
+
+        n = self.n
+        if model is None:
+            model = self.generator.random(n) < 0.5
+        if counts is None:
+            counts = true_counts(self.matrix, model)
+        self.model = [False] + [bool(value) for value in model]
+
+        # sum of the true variables per clause, the only one where counts == 1
+        sums = (true_literals(self.matrix, model) * np.abs(self.matrix)).sum(axis = 1)
+        unsat = np.flatnonzero(counts == 0)
+        makes = np.bincount(np.abs(self.matrix[unsat]).ravel(), minlength = n + 1)
+        breaks = np.bincount(sums[counts == 1], minlength = n + 1)
+
+        self.true_count = counts.tolist()
+        self.true_sum = sums.tolist()
+        self.breaks = breaks.tolist()
+        self.score = (makes - breaks).tolist()
+        self.score[0] = -len(self.clauses) - 1      # never picked (also the padding)
+        self.unsat = unsat.tolist()
+        self.unsat_pos = [-1] * len(self.clauses)
+        for i, ci in enumerate(self.unsat):
+            self.unsat_pos[ci] = i
+
+        self.heap = None
+        if self.strategy == "gsat":
+            self.heap = [(-self.score[v], v) for v in range(1, n + 1)]
+            heapify(self.heap)
+
+    def flip(self, v):
+        n, model = self.n, self.model
+        true_count, true_sum, breaks, score = self.true_count, self.true_sum, self.breaks, self.score
+        unsat, unsat_pos, variables = self.unsat, self.unsat_pos, self.variables
+
+        model[v] = not model[v]
+        now_true = v if model[v] else -v
+
+        for ci in self.occurrences[now_true + n]:
+            count = true_count[ci]
+            if count == 0:
+                last = unsat.pop()
+                if last != ci:
+                    unsat[unsat_pos[ci]] = last
+                    unsat_pos[last] = unsat_pos[ci]
+                unsat_pos[ci] = -1
+                for u in variables[ci]:
+                    score[u] -= 1
+                breaks[v] += 1
+                score[v] -= 1
+            elif count == 1:
+                breaks[true_sum[ci]] -= 1
+                score[true_sum[ci]] += 1
+            true_count[ci] = count + 1
+            true_sum[ci] += v
+
+        for ci in self.occurrences[-now_true + n]:
+            count = true_count[ci]
+            true_count[ci] = count - 1
+            true_sum[ci] -= v
+            if count == 1:
+                unsat_pos[ci] = len(unsat)
+                unsat.append(ci)
+                for u in variables[ci]:
+                    score[u] += 1
+                breaks[v] -= 1
+                score[v] += 1
+            elif count == 2:
+                breaks[true_sum[ci]] += 1
+                score[true_sum[ci]] -= 1
+
+        heap = self.heap
+        if heap is not None:
+            if len(heap) > 4 * n + 100:
+                self.heap = heap = [(-score[u], u) for u in range(1, n + 1)]
+                heapify(heap)
+            else:
+                # every variable whose score may have changed gets a fresh entry
+                for ci in self.occurrences[v + n]:
+                    for u in variables[ci]:
+                        heappush(heap, (-score[u], u))
+                for ci in self.occurrences[-v + n]:
+                    for u in variables[ci]:
+                        heappush(heap, (-score[u], u))
+                heappush(heap, (-score[v], v))
+
+    def pick(self):
+        if self.strategy == "gsat":
+            # best score, smallest variable on ties
+            heap, score = self.heap, self.score
+            while -heap[0][0] != score[heap[0][1]]:
+                heappop(heap)
+            return heap[0][1]
+
+        candidates = self.variables[self.unsat[self.rng.randrange(len(self.unsat))]]
+        breaks = self.breaks
+
+        if self.strategy == "walksat":
+            least = min(breaks[v] for v in candidates)
+            if least > 0 and self.rng.random() < self.noise:
+                return self.rng.choice(candidates)
+            return self.rng.choice([v for v in candidates if breaks[v] == least])
+
+        weights = [(self.eps + breaks[v]) ** -self.cb for v in candidates]
+        return self.rng.choices(candidates, weights)[0]
+
+    def solve(self, max_flips, max_restarts, batch = 64, seconds = None, flips = None, stats = None):
+        """ The restart models are drawn and scored batch at a time, a
+            batch that already contains a model skips the search
+
+            Output: True if a model was found, False if all restarts failed
+                    (or the formula has an empty clause) and None if the
+                    budget (seconds, total flips) ran out """
+
+        if self.empty:
+            return False
+        if not self.clauses:
+            self.restart(np.zeros(self.n, dtype = bool))
             return True
 
-        for j in range(max_flips):
-            model = optimal_flip(clauses, model)
-
-            if resolve(clauses, model):
+        deadline = None if seconds is None else perf_counter() + seconds
+        timers = stats is not None and stats.timers
+        total = 0
+
+        for first in range(0, max_restarts, batch):
+            if timers:
+                start = perf_counter()
+            models = self.generator.random((min(batch, max_restarts - first), self.n)) < 0.5
+            counts = true_counts(self.matrix, models)
+            if timers:
+                stats.time("evaluate", start)
+
+            solved = np.flatnonzero((counts > 0).all(axis = 1))
+            if len(solved):
+                self.restart(models[solved[0]], counts[solved[0]])
                 return True
 
-    return False
-
-
-def resolve(clauses, model):
-    
-    r_cnf = True
-    for clause in clauses:
-        r_clause = False
-        
-        for literal in clause:
-            if literal > 0:
-                if model[abs(literal) - 1]:
-                    r_clause = True
-            else:
-                if not model[abs(literal) - 1]:
-                    r_clause = True
-
-        if not r_clause:
-            r_cnf = False
-
-    return r_cnf
-
-
-def optimal_flip(clauses, model):
-
-    flip_scores = []
-
-    for i in range(len(model)):
-        model[i] = not model[i]
-        score = 0
+            for model, count in zip(models, counts):
+                if stats is not None:
+                    stats.restarts += 1
+                    if timers:
+                        start = perf_counter()
+                self.restart(model, count)
+                if timers:
+                    start = stats.time("restart", start)
+
+                for j in range(max_flips):
+                    self.flip(self.pick())
+                    if stats is not None:
+                        stats.flips += 1
+                        stats.tick()
+                    if not self.unsat:
+                        if timers:
+                            stats.time("flip", start)
+                        return True
+
+                    total += 1
+                    if (flips is not None and total >= flips or
+                            deadline is not None and total & 255 == 0 and perf_counter() > deadline):
+                        if timers:
+                            stats.time("flip", start)
+                        return None
+
+                if timers:
+                    stats.time("flip", start)
 
-        for clause in clauses:
-            if resolve([clause], model):
-                score += 1
-
-        flip_scores.append(score)
-        model[i] = not model[i]
+        return False
 
-    index = flip_scores.index(max(flip_scores))
-    model[index] = not model[index]
 
-    return model
+def gsat(clauses, max_flips, max_restarts, n, strategy = "gsat", seed = None, seconds = None, flips = None,
+         stats = None):
+    return LocalSearch(clauses, n, seed, strategy).solve(max_flips, max_restarts, seconds = seconds, flips = flips,
+                                                         stats = stats)
 
 
-def gsat_auxi(c):
-    return gsat(c, 7*n, 2*n, n)
+def resolve(clauses, model):
+    return bool(satisfies(clauses, model))
 
 
-#--------------------------------------------------------------------------------------------------
 # DLL ---------------------------------------------------------------------------------------------
 
-def dll(clauses):
-    clauses = deepcopy(clauses)
-    
-    if len(clauses) == 0:
-        return True
-    
-    if len([True for clause in clauses if len(clause) == 0]) > 0:
-        return False
+class WatchedClauses(object):
+    """ Clause database with two watched literals per clause and an
+        assignment trail, the common core of the dll and cdcl engines.
 
-    unit_clauses = []
-    for clause in clauses:
-        if len(clause) == 1:
-            unit_clauses.append(clause)
+        Literal l is stored at position l + n of the per-literal lists, value
+        is 1 (true), -1 (false) or 0 (unassigned).  Clauses are lists of ints
+        whose first two literals are the watched ones. """
 
-    if len(unit_clauses) > 0:
-        literal = choice(unit_clauses)[0]
-        return dll(simplify(clauses, literal))
+    def __init__(self, clauses, n = None):
+        normalized = []
+        for clause in clauses:
+            clause = list(dict.fromkeys(int(l) for l in clause))
+            if any(-l in clause for l in clause):
+                continue            # tautology
+            normalized.append(clause)
+
+        if n is None:
+            n = max((abs(l) for clause in normalized for l in clause), default = 0)
+        self.n = n
+
+        self.value = [0] * (2*n + 1)
+        self.level = [0] * (n + 1)
+        self.reason = [None] * (n + 1)
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+
+        self.clauses = []
+        self.watches = [[] for i in range(2*n + 1)]
+        self.units = []
+        self.empty = False
+
+        for clause in normalized:
+            if len(clause) == 0:
+                self.empty = True
+            elif len(clause) == 1:
+                self.units.append(clause[0])
+            else:
+                self.attach(clause)
 
-    vs = []
-    for clause in clauses:
-        for literal in clause:
-            vs.append(literal)
-    v = choice(vs)
+    def start_budget(self, seconds = None, conflicts = None):
+        """ Cooperative limits of a solve() call, checked at every conflict """
 
-    if dll(simplify(clauses, v)):
-        return True
-    else:
-        return dll(simplify(clauses, -v))
+        self.deadline = None if seconds is None else perf_counter() + seconds
+        self.conflict_budget = conflicts
 
+    def out_of_budget(self, conflicts):
+        if self.conflict_budget is not None and conflicts > self.conflict_budget:
+            return True
+        return self.deadline is not None and perf_counter() > self.deadline
+
+    def attach(self, clause):
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[clause[0] + self.n].append(index)
+        self.watches[clause[1] + self.n].append(index)
+        return index
+
+    def assign(self, literal, reason):
+        n = self.n
+        self.value[literal + n] = 1
+        self.value[-literal + n] = -1
+        self.level[abs(literal)] = len(self.trail_lim)
+        self.reason[abs(literal)] = reason
+        self.trail.append(literal)
+
+    def assign_units(self):
+        # top level units, False if two of them contradict
+        for literal in self.units:
+            v = self.value[literal + self.n]
+            if v == -1:
+                return False
+            if v == 0:
+                self.assign(literal, None)
+        return True
 
-def simplify(clauses, literal):
-    result = deepcopy(clauses)
-    r_c = []
-    r_l = []
+    def propagate(self):
+        """ Unit propagation over the watch lists, returns the index of a
+            falsified clause or None """
+
+        value, watches, clauses, trail, n = self.value, self.watches, self.clauses, self.trail, self.n
+        level, reason = self.level, self.reason
+        current = len(self.trail_lim)
+
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            ws = watches[false_lit + n]
+            i = j = 0
+            end = len(ws)
+
+            while i < end:
+                ci = ws[i]
+                i += 1
+                c = clauses[ci]
+
+                if c[0] == false_lit:
+                    c[0] = c[1]
+                    c[1] = false_lit
+                first = c[0]
+
+                if value[first + n] == 1:
+                    ws[j] = ci
+                    j += 1
+                    continue
+
+                for p in range(2, len(c)):
+                    l = c[p]
+                    if value[l + n] != -1:
+                        c[1] = l
+                        c[p] = false_lit
+                        watches[l + n].append(ci)
+                        break
+                else:
+                    ws[j] = ci
+                    j += 1
+
+                    if value[first + n] == -1:
+                        while i < end:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        return ci
+
+                    value[first + n] = 1
+                    value[-first + n] = -1
+                    level[abs(first)] = current
+                    reason[abs(first)] = ci
+                    trail.append(first)
+
+            del ws[j:]
+
+        return None
+
+    def backtrack(self, level):
+        """ Undoes every assignment above decision level level """
+
+        if len(self.trail_lim) <= level:
+            return
+
+        value, n = self.value, self.n
+        start = self.trail_lim[level]
+        for literal in self.trail[start:]:
+            value[literal + n] = 0
+            value[-literal + n] = 0
+            self.reason[abs(literal)] = None
+            self.unassigned(literal)
+
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def unassigned(self, literal):
+        pass
+
+    def model(self):
+        # unassigned variables are free, they are reported as True
+        return [self.value[v + self.n] != -1 for v in range(1, self.n + 1)]
+
+
+class DPLL(WatchedClauses):
+    """ Iterative DPLL: unit propagation, chronological backtracking by
+        flipping the most recent unflipped decision, no clause copying.
+
+        Variables are branched on in a fixed order, most occurrences first,
+        with the polarity that satisfies more clauses. """
+
+    def __init__(self, clauses, n = None):
+        WatchedClauses.__init__(self, clauses, n)
+
+        counts = [0] * (2*self.n + 1)
+        for clause in self.clauses:
+            for l in clause:
+                counts[l + self.n] += 1
+        for l in self.units:
+            counts[l + self.n] += 1
+
+        n = self.n
+        self.order = sorted(range(1, n + 1), key = lambda v: -(counts[v + n] + counts[-v + n]))
+        self.rank = [0] * (n + 1)
+        for i, v in enumerate(self.order):
+            self.rank[v] = i
+        self.phase = [1 if counts[v + n] >= counts[-v + n] else -1 for v in range(n + 1)]
+        self.next = 0
+
+    def unassigned(self, literal):
+        if self.rank[abs(literal)] < self.next:
+            self.next = self.rank[abs(literal)]
+
+    def decide(self):
+        value, order, n = self.value, self.order, self.n
+        while self.next < len(order):
+            v = order[self.next]
+            if value[v + n] == 0:
+                return v * self.phase[v]
+            self.next += 1
+        return None
+
+    def solve(self, seconds = None, conflicts = None, stats = None):
+        """ True or False, None if the budget (seconds, conflicts) ran out;
+            stats is an optional stats.SearchStats """
+
+        if self.empty or not self.assign_units():
+            return False
+
+        self.start_budget(seconds, conflicts)
+        flipped = []    # per decision level, whether its decision was flipped
+        total = 0
+
+        while True:
+            if stats is None:
+                conflict = self.propagate()
+            else:
+                start, before = perf_counter(), len(self.trail)
+                conflict = self.propagate()
+                stats.propagations += len(self.trail) - before
+                if stats.timers:
+                    stats.time("propagate", start)
+
+            if conflict is not None:
+                total += 1
+                if stats is not None:
+                    stats.conflicts += 1
+                    stats.backtracks += 1
+                    stats.tick()
+                if self.out_of_budget(total):
+                    return None
+
+                while flipped and flipped[-1]:
+                    flipped.pop()
+                    self.backtrack(len(flipped))
+                if not flipped:
+                    return False
+
+                literal = self.trail[self.trail_lim[-1]]
+                flipped.pop()
+                self.backtrack(len(flipped))
+                self.trail_lim.append(len(self.trail))
+                flipped.append(True)
+                self.assign(-literal, None)
+                continue
+
+            literal = self.decide()
+            if literal is None:
+                return True
 
-    for i, clause in enumerate(clauses):
-        if literal in clause:
-            r_c.append(i)
-        elif -literal in clause:
-            r_l.append(i)
+            self.trail_lim.append(len(self.trail))
+            flipped.append(False)
+            self.assign(literal, None)
+            if stats is not None:
+                stats.decisions += 1
+                stats.depth(len(self.trail_lim))
+
+
+def dll(clauses, n = None, seconds = None, conflicts = None, stats = None):
+    return DPLL(clauses, n).solve(seconds, conflicts, stats)
+
+
+# CDCL --------------------------------------------------------------------------------------------
+
+def luby(i):
+    # i-th element (from 1) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ...
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class CDCL(WatchedClauses):
+    """ Conflict driven clause learning on top of the watched clause database
+
+        - 1-UIP conflict analysis with non-chronological backjumping
+        - EVSIDS branching (bumped activities, geometric increment) over a
+          lazy heap, with phase saving
+        - Luby or geometric restarts every restart_base conflicts (times the
+          Luby value / restart_growth ** restarts)
+        - learned clause database reduction: when the learned clauses exceed
+          the limit, the half with the highest LBD is dropped, glue clauses
+          (LBD <= 2) and clauses that are the reason of an assignment stay """
+
+    def __init__(self, clauses, n = None, restarts = "luby", restart_base = 100, restart_growth = 1.5,
+                 var_decay = 0.95, learnt_ratio = 1/3, learnt_growth = 1.1):
+        WatchedClauses.__init__(self, clauses, n)
+        n = self.n
+
+        self.restarts = restarts
+        self.restart_base = restart_base
+        self.restart_growth = restart_growth
+        self.var_decay = var_decay
+        self.learnt_growth = learnt_growth
+        self.max_learnts = max(len(self.clauses) * learnt_ratio, 100)
+
+        self.activity = [0.0] * (n + 1)
+        self.var_inc = 1.0
+        self.heap = [(0.0, v) for v in range(1, n + 1)]
+        self.saved_phase = [-1] * (n + 1)
+        self.seen = [False] * (n + 1)
+
+        self.learnts = []
+        self.lbd = dict()
+
+    def unassigned(self, literal):
+        var = abs(literal)
+        self.saved_phase[var] = 1 if literal > 0 else -1
+        heappush(self.heap, (-self.activity[var], var))
+
+    def bump(self, var):
+        activity = self.activity
+        activity[var] += self.var_inc
+        if activity[var] > 1e100:
+            for v in range(1, self.n + 1):
+                activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+            self.heap = [(-activity[v], v) for v in range(1, self.n + 1) if self.value[v + self.n] == 0]
+            heapify(self.heap)
+        elif self.value[var + self.n] == 0:
+            heappush(self.heap, (-activity[var], var))
+
+    def decide(self):
+        heap, activity, value, n = self.heap, self.activity, self.value, self.n
+
+        if len(heap) > 4 * n + 100:
+            self.heap = heap = [(-activity[v], v) for v in range(1, n + 1) if value[v + n] == 0]
+            heapify(heap)
+
+        while heap:
+            a, v = heappop(heap)
+            if value[v + n] == 0 and -a == activity[v]:
+                return v * self.saved_phase[v]
+        return None
+
+    def analyze(self, conflict):
+        """ 1-UIP learned clause (asserting literal first, highest level
+            literal second) and the level to backjump to """
+
+        seen, level, reason, trail, clauses = self.seen, self.level, self.reason, self.trail, self.clauses
+        current = len(self.trail_lim)
+
+        learnt = [0]
+        counter = 0
+        p = 0
+        clause = clauses[conflict]
+        index = len(trail) - 1
+
+        while True:
+            for q in clause:
+                if q == p:
+                    continue
+                v = abs(q)
+                if not seen[v] and level[v] > 0:
+                    seen[v] = True
+                    self.bump(v)
+                    if level[v] >= current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+
+            while not seen[abs(trail[index])]:
+                index -= 1
+            p = trail[index]
+            index -= 1
+            seen[abs(p)] = False
+            counter -= 1
+            if counter == 0:
+                break
+            clause = clauses[reason[abs(p)]]
+
+        learnt[0] = -p
+        for q in learnt[1:]:
+            seen[abs(q)] = False
+
+        if len(learnt) == 1:
+            return learnt, 0
+
+        best = max(range(1, len(learnt)), key = lambda i: level[abs(learnt[i])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[abs(learnt[1])]
+
+    def reduce(self):
+        locked = set(self.reason[abs(l)] for l in self.trail)
+        ranked = sorted(self.learnts, key = lambda ci: self.lbd[ci])
+        keep, drop = ranked[:len(ranked) // 2], ranked[len(ranked) // 2:]
+
+        self.learnts = keep
+        for ci in drop:
+            if self.lbd[ci] <= 2 or ci in locked:
+                self.learnts.append(ci)
+            else:
+                self.clauses[ci] = None
+                del self.lbd[ci]
+
+        n = self.n
+        self.watches = [[] for i in range(2*n + 1)]
+        for ci, c in enumerate(self.clauses):
+            if c is not None:
+                self.watches[c[0] + n].append(ci)
+                self.watches[c[1] + n].append(ci)
+
+        self.max_learnts *= self.learnt_growth
+
+    def restart_limit(self, restarts):
+        if self.restarts == "luby":
+            return self.restart_base * luby(restarts + 1)
+        return self.restart_base * self.restart_growth ** restarts
+
+    def solve(self, seconds = None, conflicts = None, stats = None):
+        """ True or False, None if the budget (seconds, conflicts) ran out;
+            stats is an optional stats.SearchStats """
+
+        if self.empty or not self.assign_units():
+            return False
+
+        self.start_budget(seconds, conflicts)
+        restarts = 0
+        since_restart = 0
+        total = 0
+        limit = self.restart_limit(restarts)
+        timers = stats is not None and stats.timers
+
+        while True:
+            if stats is None:
+                conflict = self.propagate()
+            else:
+                start, before = perf_counter(), len(self.trail)
+                conflict = self.propagate()
+                stats.propagations += len(self.trail) - before
+                if timers:
+                    stats.time("propagate", start)
+
+            if conflict is not None:
+                since_restart += 1
+                total += 1
+                if stats is not None:
+                    stats.conflicts += 1
+                    stats.tick()
+                if not self.trail_lim:
+                    return False
+                if self.out_of_budget(total):
+                    return None
+
+                if timers:
+                    start = perf_counter()
+                learnt, level = self.analyze(conflict)
+                if timers:
+                    stats.time("analyze", start)
+                if stats is not None:
+                    stats.backtracks += 1
+                self.backtrack(level)
+
+                if len(learnt) == 1:
+                    self.assign(learnt[0], None)
+                else:
+                    ci = self.attach(learnt)
+                    self.learnts.append(ci)
+                    self.lbd[ci] = len(set(self.level[abs(l)] for l in learnt))
+                    self.assign(learnt[0], ci)
+
+                self.var_inc /= self.var_decay
+                continue
+
+            if since_restart >= limit:
+                restarts += 1
+                since_restart = 0
+                limit = self.restart_limit(restarts)
+                self.backtrack(0)
+                if stats is not None:
+                    stats.restarts += 1
+
+            if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                if timers:
+                    start = perf_counter()
+                self.reduce()
+                if timers:
+                    stats.time("reduce", start)
+
+            if timers:
+                start = perf_counter()
+            literal = self.decide()
+            if timers:
+                stats.time("decide", start)
+            if literal is None:
+                return True
 
-    r_c = r_c[::-1]
-    r_l = r_l[::-1]
+            self.trail_lim.append(len(self.trail))
+            self.assign(literal, None)
+            if stats is not None:
+                stats.decisions += 1
+                stats.depth(len(self.trail_lim))
 
-    for i in r_l:
-        result[i].remove(-literal)
-    for i in r_c:
-        del result[i]
 
-    return result
+def cdcl(clauses, n = None, seconds = None, conflicts = None, stats = None):
+    return CDCL(clauses, n).solve(seconds, conflicts, stats)
 
 
 # -------------------------------------------------------------------------------------------------
@@ -154,59 +754,9 @@ def simplify(clauses, literal):
     print(dll(c)) """
 
 if __name__ == "__main__":
-    algo = argv[1]
-    k, n, cases = [int(i) for i in argv[2:]]
-    workers = Pool(processes = 6)
-    x = []
-    y1 = []
-    y2 = []
-
-
-    if algo == "gsat":
-        algo_fn = gsat_auxi
-    elif algo == "dll":
-        algo_fn = dll
-    else:
-        quit(""" Incorrect option for algorithm! \nPlease use either "gsat" or "dll" """)
-    
-
-    for m in range(int(n/4), 8*n+1, int(n/4)):
-
-        inputs = [cnf(k, m, n) for i in range(cases)]
-
-        start_time = time()
-        output = workers.map(algo_fn, inputs)
-        call_time = time() - start_time
-
-        solvable = reduce(lambda x, y: x+y, output)
-
-        y1.append(solvable / cases)
-        y2.append(call_time)
-        x.append(m/n)
-
-        print(m/n)
-
-    # Plotting via matplotlib
-    fig,ax = plt.subplots(nrows=1, ncols=2, figsize=(25, 10))
-    plt.subplots_adjust(wspace = 0.3, hspace = 0.3)
-    ax[0].grid(b=True, which='major', color='#666666', linestyle='-')
-    ax[0].minorticks_on()
-    ax[0].grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
-    ax[1].grid(b=True, which='major', color='#666666', linestyle='-')
-    ax[1].minorticks_on()
-    ax[1].grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
-
-    ax[0].set_title("Probability vs Clause/Symbol")
-    ax[0].set_xlabel("Clause/Symbol Ratio or m/n")
-    ax[0].set_ylabel("Probability")
-    ax[1].set_title("Runtime")
-    ax[1].set_xlabel("Clause/Symbol Ratio or m/n")
-    ax[1].set_ylabel("Runtime(s)")
-
-    ax[0].plot(x, y1, label = "Probability", marker = 'o')
-    ax[0].plot([4.3, 4.3], [0, 1], label = "X = 4.3", ls = '--', color = 'red')
-    ax[1].plot(x, y2, label = "Runtime in seconds", marker = 'o')
-
-    ax[0].legend()
-    ax[1].legend()
-    fig.savefig("Out.png", dpi=200)
\ No newline at end of file
+    from bench import sweep_driver
+
+    if len(argv) < 2 or argv[1] not in ("gsat", "walksat", "probsat", "dll", "cdcl"):
+        quit(""" Incorrect option for algorithm! \nPlease use one of "gsat", "walksat", "probsat", "dll" or "cdcl" """)
+
+    sweep_driver(argv[1], argv[2:], script = "dll_gsat.py algorithm")
@@ -0,0 +1,84 @@
+# imports
+
+import numpy as np
+
+BLOCK_LITERALS = 1 << 22        # literals evaluated at once, bounds the (B, m, k) temporaries
+
+
+# function definitions
+
+def clause_matrix(clauses):
+    """ Clauses as an (m, k) int32 array
+
+        Input:  clauses(2D int array or list of clauses of any width)
+
+        Output: (m, k) array, k the widest clause; shorter clauses are
+                padded with 0, which is never true """
+
+    if isinstance(clauses, np.ndarray) and clauses.ndim == 2:
+        return clauses.astype(np.int32, copy = False)
+
+    clauses = [list(c) for c in clauses]
+    width = max((len(c) for c in clauses), default = 0)
+    matrix = np.zeros((len(clauses), width), dtype = np.int32)
+    for i, c in enumerate(clauses):
+        matrix[i, :len(c)] = c
+    return matrix
+
+
+def true_literals(clauses, models):
+    """ Which literals of every clause are true under a batch of models
+
+        Input:  clauses((m, k) int array, 0 for padding),
+                models((B, n) or (n,) boolean array, column v - 1 is the
+                value of variable v)
+
+        Output: (B, m, k) boolean array, or (m, k) for a single model """
+
+    clauses = clause_matrix(clauses)
+    models = np.asarray(models, dtype = bool)
+    single = models.ndim == 1
+    models = np.atleast_2d(models)
+
+    # column 0 of the padded models is the false "variable" 0 of the padding
+    padded = np.zeros((len(models), models.shape[1] + 1), dtype = bool)
+    padded[:, 1:] = models
+
+    values = padded[:, np.abs(clauses)]
+    result = (values == (clauses > 0)) & (clauses != 0)
+    return result[0] if single else result
+
+
+def true_counts(clauses, models):
+    """ Number of true literals per clause, (B, m) int array (or (m,)) """
+
+    clauses = clause_matrix(clauses)
+    models = np.asarray(models, dtype = bool)
+    if models.ndim == 1:
+        return true_counts(clauses, models[None])[0]
+
+    block = max(1, BLOCK_LITERALS // max(clauses.size, 1))
+    counts = np.empty((len(models), len(clauses)), dtype = np.int32)
+    for start in range(0, len(models), block):
+        counts[start:start + block] = true_literals(clauses, models[start:start + block]).sum(axis = 2)
+    return counts
+
+
+def evaluate(clauses, models):
+    """ Scores a batch of assignments against a formula in one pass
+
+        Input:  clauses((m, k) int array or list of clauses),
+                models((B, n) or (n,) boolean array)
+
+        Output: satisfied(number of satisfied clauses per model, (B,)) and
+                unsatisfied((B, m) boolean mask of the falsified clauses);
+                np.flatnonzero(unsatisfied[b]) are the indices for model b """
+
+    unsatisfied = true_counts(clauses, models) == 0
+    return (~unsatisfied).sum(axis = -1), unsatisfied
+
+
+def satisfies(clauses, models):
+    """ Whether each model satisfies every clause, (B,) boolean (or a bool) """
+
+    return ~(true_counts(clauses, models) == 0).any(axis = -1)
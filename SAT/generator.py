@@ -0,0 +1,86 @@
+# imports
+
+from math import comb
+import numpy as np
+
+
+# function definitions
+
+def random_kcnf(k, m, n, seed = None, unique = True):
+    """ Creates a random k-CNF instance as a signed integer array
+
+    Input:  k(integer), m(integer), n(integer), seed, unique(boolean)
+
+            k:      the number of literals per clause
+            m:      number of clauses in the sentence
+            n:      the number of unique variables in the sentence
+            seed:   anything numpy.random.default_rng accepts, including a
+                    Generator (which is then advanced)
+            unique: no clause appears twice
+
+    Example Input:  k = 3
+                    m = 50
+                    n = 50
+
+    Output: int32 array of shape (m, k); literal i is
+            variable i, literal -i its negation.  The k variables of a
+            clause are distinct and sorted by index. """
+
+    if k > n:
+        raise ValueError("k = {} literals per clause need at least as many variables, n = {}".format(k, n))
+    if unique and m > comb(n, k) * 2**k:
+        raise ValueError("only {} distinct {}-clauses exist over {} variables, m = {}".format(comb(n, k) * 2**k, k, n, m))
+
+    rng = np.random.default_rng(seed)
+    clauses = _random_clauses(rng, m, k, n)
+
+    if unique:
+        duplicates = _duplicate_clauses(clauses)
+        while len(duplicates):
+            clauses[duplicates] = _random_clauses(rng, len(duplicates), k, n)
+            duplicates = _duplicate_clauses(clauses)
+
+    return clauses
+
+
+def instance(k, m, n, seed, unique = True):
+    """ The random k-CNF instance identified by (k, n, m, seed)
+
+        The whole descriptor seeds the generator, so every (k, n, m, seed)
+        names one fixed instance no matter where or in which order it is
+        drawn, and instances that only differ in m are independent. """
+
+    return random_kcnf(k, m, n, seed = [seed, k, n, m], unique = unique)
+
+
+def _random_clauses(rng, count, k, n):
+    """ count clauses of k distinct sorted variables with random signs """
+
+    if k * k > 2 * n:
+        variables = np.argsort(rng.random((count, n)), axis = 1)[:, :k] + 1
+        variables.sort(axis = 1)
+    else:
+        variables = rng.integers(1, n + 1, size = (count, k))
+        variables.sort(axis = 1)
+        redraw = np.flatnonzero((variables[:, 1:] == variables[:, :-1]).any(axis = 1))
+        while len(redraw):
+            fresh = rng.integers(1, n + 1, size = (len(redraw), k))
+            fresh.sort(axis = 1)
+            variables[redraw] = fresh
+            redraw = redraw[(fresh[:, 1:] == fresh[:, :-1]).any(axis = 1)]
+
+    signs = rng.integers(0, 2, size = (count, k)) * 2 - 1
+    return (variables * signs).astype(np.int32)
+
+
+def _duplicate_clauses(clauses):
+    """ Row indices of clauses that repeat an earlier clause (all but one
+        copy of every repeated clause) """
+
+    m, k = clauses.shape
+    order = np.lexsort(tuple(clauses[:, j] for j in range(k - 1, -1, -1)))
+    rows = clauses[order]
+    same = (rows[1:] == rows[:-1]).all(axis = 1)
+
+    return order[1:][same]
+
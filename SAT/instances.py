@@ -0,0 +1,235 @@
+# imports
+
+import os
+import sys
+import json
+import numpy as np
+from generator import instance
+from dimacs import iter_clauses
+
+FORMAT_VERSION = 1
+HEADER_FILE = "header.json"
+TABLE_FILE = "instances.npy"
+LITERALS_FILE = "literals.bin"
+OFFSETS_FILE = "clause_offsets.bin"
+
+TABLE_DTYPE = np.dtype([
+    ("k", np.int32),            # literals per clause, 0 for mixed widths
+    ("n", np.int64),
+    ("m", np.int64),
+    ("seed", np.int64),         # -1 for imported instances (logged as -1 - row, see imported_points)
+    ("clause_start", np.int64), # first clause in clause_offsets
+    ("name", "U64"),
+])
+
+
+# class definitions
+
+class InstanceCorpus(object):
+    """ On-disk collection of CNF instances
+
+        All literals live in one flat int32 file and clause_offsets[c] is the
+        position of the first literal of clause c, so every instance is a
+        contiguous, memory-mapped slice that is only read when it is used.
+        Instances are indexed by (k, n, m, seed); imported instances get
+        seed -1 and keep their file name.
+
+        Input:  path(directory), mode("r" to read, "a" to add instances) """
+
+    def __init__(self, path, mode = "r"):
+        self.path = path
+        self.mode = mode
+
+        if mode == "a" and not os.path.exists(path):
+            os.makedirs(path)
+            with open(os.path.join(path, HEADER_FILE), "w") as f:
+                json.dump({"format_version": FORMAT_VERSION}, f)
+            np.save(os.path.join(path, TABLE_FILE), np.zeros(0, dtype = TABLE_DTYPE))
+            for name in (LITERALS_FILE, OFFSETS_FILE):
+                open(os.path.join(path, name), "wb").close()
+
+        with open(os.path.join(path, HEADER_FILE)) as f:
+            version = json.load(f).get("format_version")
+        if version != FORMAT_VERSION:
+            raise ValueError("Corpus {} has format version {}, expected {}".format(path, version, FORMAT_VERSION))
+
+        self.table = np.load(os.path.join(path, TABLE_FILE))
+        self.keys = {(int(r["k"]), int(r["n"]), int(r["m"]), int(r["seed"])): i
+                     for i, r in enumerate(self.table) if r["seed"] >= 0}
+        self.added = []
+        self._maps = None
+
+        if mode == "a":
+            self._literals = open(os.path.join(path, LITERALS_FILE), "ab")
+            self._offsets = open(os.path.join(path, OFFSETS_FILE), "ab")
+            self._n_literals = self._literals.tell() // 4
+            self._n_clauses = self._offsets.tell() // 8
+
+    def __len__(self):
+        return len(self.table) + len(self.added)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, clauses, n, k = 0, seed = -1, name = ""):
+        """ Appends an instance, given as a 2D int array or a list of clauses
+
+            Output: number of the instance """
+
+        if self.mode != "a":
+            raise ValueError("Corpus {} is opened read only".format(self.path))
+
+        if isinstance(clauses, np.ndarray) and clauses.ndim == 2:
+            literals = clauses.astype(np.int32).reshape(-1)
+            widths = np.full(len(clauses), clauses.shape[1], dtype = np.int64)
+        else:
+            literals = np.fromiter((l for c in clauses for l in c), dtype = np.int32)
+            widths = np.fromiter((len(c) for c in clauses), dtype = np.int64, count = len(clauses))
+
+        offsets = self._n_literals + np.concatenate([[0], np.cumsum(widths)])[:-1].astype(np.int64)
+
+        row = (k, n, len(widths), seed, self._n_clauses, name)
+        self._literals.write(literals.tobytes())
+        self._offsets.write(offsets.tobytes())
+        self._n_literals += len(literals)
+        self._n_clauses += len(widths)
+
+        self.added.append(row)
+        if seed >= 0:
+            self.keys[(k, n, len(widths), seed)] = len(self) - 1
+        return len(self) - 1
+
+    def close(self):
+        """ Writes the instance table of an appending corpus """
+
+        if self.mode != "a" or self._literals.closed:
+            return
+
+        self._literals.close()
+        self._offsets.close()
+
+        if self.added:
+            self.table = np.concatenate([self.table, np.array(self.added, dtype = TABLE_DTYPE)])
+            self.added = []
+            tmp = os.path.join(self.path, "instances.tmp.npy")
+            np.save(tmp, self.table)
+            os.replace(tmp, os.path.join(self.path, TABLE_FILE))
+
+    def find(self, k, n, m, seed):
+        """ Number of the instance (k, n, m, seed), or None """
+
+        return self.keys.get((k, n, m, seed))
+
+    def select(self, k = None, n = None, m = None):
+        """ Numbers of the instances matching all given fields """
+
+        mask = np.ones(len(self.table), dtype = bool)
+        for field, value in (("k", k), ("n", n), ("m", m)):
+            if value is not None:
+                mask &= self.table[field] == value
+        return np.flatnonzero(mask)
+
+    def get(self, i):
+        """ Clauses of instance i, read from the memory map
+
+            Output: (m, k) int32 array for fixed width instances, otherwise
+                    a list of int32 arrays """
+
+        if self._maps is None:
+            self._maps = (np.memmap(os.path.join(self.path, LITERALS_FILE), dtype = np.int32, mode = "r"),
+                          np.memmap(os.path.join(self.path, OFFSETS_FILE), dtype = np.int64, mode = "r"))
+        literals, offsets = self._maps
+
+        row = self.table[i]
+        start, m = row["clause_start"], row["m"]
+        if row["k"] > 0:
+            first = offsets[start]
+            return np.asarray(literals[first:first + m * row["k"]]).reshape(m, row["k"])
+
+        bounds = np.append(offsets[start:start + m], offsets[start + m] if start + m < len(offsets) else len(literals))
+        return [np.asarray(literals[bounds[j]:bounds[j + 1]]) for j in range(m)]
+
+    def instance(self, k, n, m, seed):
+        i = self.find(k, n, m, seed)
+        if i is None:
+            raise KeyError("Corpus {} has no instance k={} n={} m={} seed={}".format(self.path, k, n, m, seed))
+        return self.get(i)
+
+
+# function definitions
+
+_open_corpora = dict()
+
+def load_instance(path, k, n, m, seed):
+    """ Worker side lookup, every process opens a corpus only once
+
+        A negative seed names imported instance -1 - seed (its row in the
+        corpus), see imported_points; mixed width instances come back as
+        lists of clauses """
+
+    if path not in _open_corpora:
+        _open_corpora[path] = InstanceCorpus(path)
+    corpus = _open_corpora[path]
+
+    if seed >= 0:
+        return corpus.instance(k, n, m, seed)
+    clauses = corpus.get(-1 - seed)
+    return clauses if isinstance(clauses, np.ndarray) else [c.tolist() for c in clauses]
+
+
+def imported_points(path):
+    """ (k, n, m, seed) of every imported instance of a corpus, with seed
+        -1 - row so sweep.run_task and the result log can tell them apart
+
+        Output: list of tuples and dict seed -> instance name """
+
+    table = InstanceCorpus(path).table
+    rows = np.flatnonzero(table["seed"] < 0)
+    points = [(int(table[i]["k"]), int(table[i]["n"]), int(table[i]["m"]), int(-1 - i)) for i in rows]
+    names = {int(-1 - i): str(table[i]["name"]) for i in rows}
+    return points, names
+
+
+def ratio_grid(n):
+    """ Clause counts of the sweeps, m/n from 1/4 to 8 in steps of 1/4 """
+
+    return list(range(int(n/4), 8*n+1, int(n/4)))
+
+
+def generate_corpus(path, k, n, cases, seed = 0, unique = True):
+    """ Adds cases instances for every ratio of the sweep grid to a corpus,
+        with seeds seed .. seed + cases - 1; existing instances are kept """
+
+    with InstanceCorpus(path, "a") as corpus:
+        for m in ratio_grid(n):
+            for s in range(seed, seed + cases):
+                if corpus.find(k, n, m, s) is None:
+                    corpus.add(instance(k, m, n, s, unique), n, k, s)
+
+
+def import_dimacs(path, files):
+    """ Adds DIMACS files (e.g. from our own workloads) to a corpus """
+
+    with InstanceCorpus(path, "a") as corpus:
+        for name in files:
+            header = dict()
+            clauses = list(iter_clauses(name, header))
+            n = header.get("n", max((abs(l) for c in clauses for l in c), default = 0))
+            corpus.add(clauses, n, name = os.path.basename(name)[:64])
+
+
+# Driver Code
+if __name__ == "__main__":
+    if len(sys.argv) >= 6 and sys.argv[1] == "generate":
+        k, n, cases = [int(i) for i in sys.argv[3:6]]
+        seed = int(sys.argv[6]) if len(sys.argv) > 6 else 0
+        generate_corpus(sys.argv[2], k, n, cases, seed)
+    elif len(sys.argv) >= 4 and sys.argv[1] == "import":
+        import_dimacs(sys.argv[2], sys.argv[3:])
+    else:
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 instances.py generate corpus_dir literal_per_clause unique_literals cases [seed]")
+        print("                python3 instances.py import corpus_dir files.cnf ...")
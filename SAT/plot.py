@@ -0,0 +1,65 @@
+# imports
+
+import sys
+import matplotlib.pyplot as plt
+from results import read_results, summarize
+
+
+# function definitions
+
+def plot(log, output = "Out.png", backend = None, k = None, n = None, config = None):
+    """ Probability and runtime against m/n from a sweep result log
+
+        Input:  log(path of a results.ResultLog), output(path),
+                backend(string), k(integer), n(integer), config(dict)
+
+                backend, k, n:  restrict the plot to these sweeps, every
+                                (backend, k, n) in the log gets its own
+                                lines otherwise
+                config:         only records of this run configuration
+                                (see sweep.run_config) """
+
+    summary = summarize(read_results(log), backend, k, n, config)
+
+    fig,ax = plt.subplots(nrows=1, ncols=2, figsize=(25, 10))
+    plt.subplots_adjust(wspace = 0.3, hspace = 0.3)
+    ax[0].grid(True, which='major', color='#666666', linestyle='-')
+    ax[0].minorticks_on()
+    ax[0].grid(True, which='minor', color='#999999', linestyle='-', alpha=0.2)
+    ax[1].grid(True, which='major', color='#666666', linestyle='-')
+    ax[1].minorticks_on()
+    ax[1].grid(True, which='minor', color='#999999', linestyle='-', alpha=0.2)
+
+    ax[0].set_title("Probability vs Clause/Symbol")
+    ax[0].set_xlabel("Clause/Symbol Ratio or m/n")
+    ax[0].set_ylabel("Probability")
+    ax[1].set_title("Runtime")
+    ax[1].set_xlabel("Clause/Symbol Ratio or m/n")
+    ax[1].set_ylabel("Median runtime(s)")
+
+    for (b, gk, gn), rows in sorted(summary.items()):
+        label = "{} k={} n={}".format(b, gk, gn) if len(summary) > 1 else b
+        x = [row["ratio"] for row in rows]
+
+        ax[0].plot(x, [row["probability"] for row in rows], label = "Probability " + label, marker = 'o')
+        if any(row["unknown"] for row in rows):
+            ax[0].plot(x, [row["unknown"] / row["samples"] for row in rows],
+                       label = "Unknown (budget exceeded) " + label, marker = 'x')
+        ax[1].plot(x, [row["median_seconds"] for row in rows], label = "Runtime " + label, marker = 'o')
+
+    ax[0].plot([4.3, 4.3], [0, 1], label = "X = 4.3", ls = '--', color = 'red')
+
+    ax[0].legend()
+    ax[1].legend()
+    fig.savefig(output, dpi=200)
+    plt.close(fig)
+
+
+# Driver Code
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 plot.py results.jsonl [output.png]")
+        quit()
+
+    plot(*sys.argv[1:])
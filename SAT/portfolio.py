@@ -0,0 +1,171 @@
+# imports
+
+import sys
+from time import perf_counter
+from multiprocessing import Process, Pipe
+from multiprocessing.connection import wait
+from backends import BACKENDS, INCOMPLETE, solve, _lists
+from dll_gsat import gsat
+from generator import instance
+from results import ResultLog
+
+# gsat / walksat are fast on satisfiable instances below the threshold but
+# can only prove SAT, the complete engines cover the rest
+DEFAULT_MEMBERS = (
+    {"backend": "walksat", "seed": 0},
+    {"backend": "cdcl"},
+    {"backend": "glucose3"},
+)
+
+
+# function definitions
+
+def member_label(member):
+    if member.get("seed") is None:
+        return member["backend"]
+    return "{}#{}".format(member["backend"], member["seed"])
+
+
+def definitive(member, result):
+    """ True always settles an instance, False only from a complete
+        backend (local search False means no model was found) """
+
+    return result is True or (result is False and member["backend"] not in INCOMPLETE)
+
+
+def _run_member(member, clauses, n, seconds, conn):
+    start = perf_counter()
+    try:
+        if member["backend"] in INCOMPLETE:
+            result = gsat(_lists(clauses), 7*n, 2*n, n, member["backend"], seed = member.get("seed"), seconds = seconds)
+        else:
+            result = solve(member["backend"], clauses, n, seconds = seconds)
+        conn.send((True, (result, perf_counter() - start)))
+    except Exception as e:
+        conn.send((False, e))
+    conn.close()
+
+
+def portfolio_solve(clauses, n, members = DEFAULT_MEMBERS, seconds = None):
+    """ Races several backends on one instance, the first definitive answer
+        wins and the other members are killed right away
+
+        Input:  clauses((m, k) int array or list of clauses), n(integer),
+                members(list of dicts), seconds(float)
+
+                members:    {"backend": name in backends.BACKENDS, "seed":
+                            integer}; the seed is used by the local search
+                            members (gsat, walksat, probsat), which can
+                            only prove SAT and never win on UNSAT
+                seconds:    budget of the whole race, also passed on to the
+                            members
+
+        An exception raised by a member is raised again here (after the
+        other members are killed); a member that dies without an answer is
+        left out of answers.
+
+        Output: dict with result (True, False, None if no member gave a
+                definitive answer in time), winner (member label or None),
+                seconds, and answers (label -> (result, seconds) of the
+                members that finished before the race ended) """
+
+    for member in members:
+        if member["backend"] not in BACKENDS:
+            raise ValueError("Unknown backend {!r}, use one of {}".format(member["backend"], ", ".join(BACKENDS)))
+
+    start = perf_counter()
+    running = dict()
+    for member in members:
+        parent, child = Pipe(duplex = False)
+        process = Process(target = _run_member, args = (member, clauses, n, seconds, child), daemon = True)
+        process.start()
+        child.close()
+        running[parent] = (member, process)
+
+    race = {"result": None, "winner": None, "answers": dict()}
+    try:
+        while running:
+            timeout = None if seconds is None else max(0.0, start + seconds - perf_counter())
+            ready = wait(list(running), timeout)
+            if not ready:
+                break
+
+            for conn in ready:
+                member, process = running.pop(conn)
+                try:
+                    ok, value = conn.recv()
+                except EOFError:
+                    continue            # the member was killed by the OS
+                finally:
+                    conn.close()
+                    process.join()
+                if not ok:
+                    raise value
+
+                result, elapsed = value
+
+                race["answers"][member_label(member)] = (result, elapsed)
+                if definitive(member, result) and race["winner"] is None:
+                    race["result"], race["winner"] = result, member_label(member)
+
+            if race["winner"] is not None:
+                break
+    finally:
+        for conn, (member, process) in running.items():
+            process.kill()
+            process.join()
+            conn.close()
+
+    race["seconds"] = perf_counter() - start
+    return race
+
+
+def race_instances(k, n, m, seeds, members = DEFAULT_MEMBERS, seconds = None, log = None):
+    """ Races the members on instances (k, n, m, seed) and records the
+        winners, the data for learning a static schedule later on
+
+        Input:  k, n, m(integers), seeds(iterable), members, seconds(float),
+                log(path of a results.ResultLog, optional)
+
+        Output: dict member label -> number of wins (None for no winner) """
+
+    wins = dict()
+    config = {"seconds": seconds, "members": [member_label(member) for member in members]}
+    results = ResultLog(log) if log else None
+    try:
+        for seed in seeds:
+            if results and results.get(k, n, m, seed, "portfolio", config):
+                winner = results.get(k, n, m, seed, "portfolio", config)["winner"]
+            else:
+                race = portfolio_solve(instance(k, m, n, seed), n, members, seconds)
+                winner = race["winner"]
+                if results:
+                    results.append({"k": k, "n": n, "m": m, "seed": seed, "backend": "portfolio",
+                                    "result": race["result"], "seconds": race["seconds"], "killed": False,
+                                    "winner": winner, "members": config["members"], "config": config})
+            wins[winner] = wins.get(winner, 0) + 1
+    finally:
+        if results:
+            results.close()
+    return wins
+
+
+# Driver Code
+if __name__ == "__main__":
+    from bench import TIME_BUDGET, RESULT_LOG
+
+    if len(sys.argv) < 5:
+        print("Incorrect syntax, Quitting\n")
+        print("Correct Syntax: python3 portfolio.py literal_per_clause unique_literals clauses instances [member ...]")
+        print("Members:        backend or backend#seed, default " + " ".join(member_label(member) for member in DEFAULT_MEMBERS))
+        quit()
+
+    k, n, m, cases = [int(i) for i in sys.argv[1:5]]
+    members = DEFAULT_MEMBERS
+    if len(sys.argv) > 5:
+        members = [{"backend": name.split("#")[0], "seed": int(name.split("#")[1]) if "#" in name else None}
+                   for name in sys.argv[5:]]
+
+    wins = race_instances(k, n, m, range(cases), members, TIME_BUDGET, RESULT_LOG)
+    for label, count in sorted(wins.items(), key = lambda item: -item[1]):
+        print("{:20} {:6d}".format(str(label), count))
@@ -0,0 +1,259 @@
+# imports
+
+from time import perf_counter
+
+
+# class definitions
+
+class Preprocessor(object):
+    """ Simplifies a CNF formula before it is handed to a backend
+
+        - top level unit propagation
+        - pure literal elimination
+        - subsumption and self-subsuming resolution (strengthening)
+        - bounded variable elimination: v is resolved away when that does
+          not add clauses (non tautological resolvents <= clauses of v)
+          and no resolvent is longer than max_resolvent
+
+        Variables keep their numbers, eliminated and fixed variables simply
+        no longer occur.  extend() turns a model of the simplified formula
+        into one of the original formula.
+
+        Input:  clauses(2D int array or list of clauses), n(integer),
+                eliminate(boolean), subsume(boolean), max_resolvent(integer),
+                max_occurrences(integer)
+
+                max_occurrences:    variables with more occurrences (of both
+                                    signs together) are not eliminated """
+
+    def __init__(self, clauses, n, eliminate = True, subsume = True, max_resolvent = 12, max_occurrences = 16):
+        self.n = n
+        self.do_eliminate = eliminate
+        self.do_subsume = subsume
+        self.max_resolvent = max_resolvent
+        self.max_occurrences = max_occurrences
+
+        self.clauses = []           # sets of literals, None once removed
+        self.occurrences = dict()   # literal -> set of clause indices
+        self.assignment = dict()    # variable -> value of fixed variables
+        self.eliminated = []        # (variable, clauses of the variable) in elimination order
+        self.units = []
+        self.unsat = False
+
+        self.removed = {"units": 0, "pure": 0, "subsumed": 0, "strengthened": 0, "eliminated": 0}
+        original = [[int(l) for l in clause] for clause in clauses]
+        self.clauses_before = len(original)
+        self.variables_before = len(set(abs(l) for clause in original for l in clause))
+
+        for clause in original:
+            clause = set(clause)
+            if not any(-l in clause for l in clause):
+                self.add(clause)
+
+    # clause database
+
+    def add(self, clause):
+        if not clause:
+            self.unsat = True
+            return None
+        ci = len(self.clauses)
+        self.clauses.append(clause)
+        for l in clause:
+            self.occurrences.setdefault(l, set()).add(ci)
+        if len(clause) == 1:
+            self.units.append(ci)
+        return ci
+
+    def remove(self, ci):
+        for l in self.clauses[ci]:
+            self.occurrences[l].discard(ci)
+        self.clauses[ci] = None
+
+    def strengthen(self, ci, literal):
+        """ Drops a false literal from clause ci """
+
+        clause = self.clauses[ci]
+        clause.discard(literal)
+        self.occurrences[literal].discard(ci)
+        if not clause:
+            self.unsat = True
+        elif len(clause) == 1:
+            self.units.append(ci)
+
+    def occurs(self, literal):
+        return self.occurrences.get(literal, ())
+
+    # simplifications
+
+    def assign(self, literal):
+        self.assignment[abs(literal)] = literal > 0
+        for ci in list(self.occurs(literal)):
+            self.remove(ci)
+        for ci in list(self.occurs(-literal)):
+            self.strengthen(ci, -literal)
+
+    def propagate(self):
+        """ Top level unit propagation, False on a conflict """
+
+        while self.units and not self.unsat:
+            ci = self.units.pop()
+            clause = self.clauses[ci]
+            if clause is None or len(clause) != 1:
+                continue
+            literal = next(iter(clause))
+            if abs(literal) in self.assignment:
+                continue
+            self.removed["units"] += 1
+            self.assign(literal)
+        return not self.unsat
+
+    def pure_literals(self):
+        changed = True
+        while changed and not self.unsat:
+            changed = False
+            for literal in list(self.occurrences):
+                if self.occurs(literal) and not self.occurs(-literal) and abs(literal) not in self.assignment:
+                    self.removed["pure"] += 1
+                    self.assign(literal)
+                    changed = True
+        return not self.unsat
+
+    def subsume(self, queue = None):
+        """ Removes subsumed clauses and strengthens clauses by
+            self-subsuming resolution, starting from the clauses in queue
+            (all clauses by default) """
+
+        if queue is None:
+            queue = [ci for ci, c in enumerate(self.clauses) if c is not None]
+        queue = sorted(queue, key = lambda ci: len(self.clauses[ci]) if self.clauses[ci] is not None else 0)
+
+        while queue and not self.unsat:
+            ci = queue.pop(0)
+            clause = self.clauses[ci]
+            if clause is None:
+                continue
+
+            # candidates must contain the rarest literal of the clause
+            pivot = min(clause, key = lambda l: len(self.occurs(l)))
+            for cj in list(self.occurs(pivot)):
+                other = self.clauses[cj]
+                if cj != ci and other is not None and len(other) >= len(clause) and clause <= other:
+                    self.remove(cj)
+                    self.removed["subsumed"] += 1
+
+            for literal in list(clause):
+                rest = clause - {literal}
+                for cj in list(self.occurs(-literal)):
+                    other = self.clauses[cj]
+                    if cj != ci and other is not None and len(other) >= len(clause) and rest <= other:
+                        self.strengthen(cj, -literal)
+                        self.removed["strengthened"] += 1
+                        queue.append(cj)
+
+            if not self.propagate():
+                break
+        return not self.unsat
+
+    def eliminate(self):
+        """ Bounded variable elimination, cheapest variables first """
+
+        candidates = sorted(set(abs(l) for l in self.occurrences),
+                            key = lambda v: len(self.occurs(v)) * len(self.occurs(-v)))
+
+        for v in candidates:
+            if self.unsat:
+                break
+            if v in self.assignment:
+                continue
+            positive, negative = list(self.occurs(v)), list(self.occurs(-v))
+            if len(positive) + len(negative) > self.max_occurrences or not positive or not negative:
+                continue
+
+            resolvents = []
+            for ci in positive:
+                for cj in negative:
+                    resolvent = (self.clauses[ci] - {v}) | (self.clauses[cj] - {-v})
+                    if any(-l in resolvent for l in resolvent):
+                        continue
+                    resolvents.append(resolvent)
+                    if len(resolvent) > self.max_resolvent or len(resolvents) > len(positive) + len(negative):
+                        break
+                else:
+                    continue
+                break
+            else:
+                self.eliminated.append((v, [sorted(self.clauses[ci]) for ci in positive + negative]))
+                self.removed["eliminated"] += 1
+                for ci in positive + negative:
+                    self.remove(ci)
+                added = [self.add(resolvent) for resolvent in resolvents]
+                if self.unsat or not self.propagate():
+                    break
+                if self.do_subsume:
+                    self.subsume([ci for ci in added if ci is not None])
+
+        return not self.unsat
+
+    # driver
+
+    def run(self):
+        """ Runs all enabled simplifications
+
+            Output: False if the formula was found unsatisfiable """
+
+        start = perf_counter()
+        if self.propagate() and self.pure_literals():
+            if self.do_subsume:
+                self.subsume()
+            if self.do_eliminate and not self.unsat:
+                self.eliminate()
+            if not self.unsat:
+                self.pure_literals()
+        self.seconds = perf_counter() - start
+        return not self.unsat
+
+    def result(self):
+        """ The simplified formula as a list of clauses (sorted literals) """
+
+        return [sorted(c) for c in self.clauses if c is not None]
+
+    def stats(self):
+        clauses = self.result()
+        return dict(self.removed,
+                    clauses_before = self.clauses_before,
+                    clauses_after = len(clauses),
+                    variables_before = self.variables_before,
+                    variables_after = len(set(abs(l) for c in clauses for l in c)),
+                    seconds = self.seconds)
+
+    def extend(self, model):
+        """ Model of the original formula from a model of the simplified one
+
+            Input:  model(list of n booleans, model[v - 1] is variable v)
+
+            Fixed variables get their value, eliminated ones are set in
+            reverse elimination order so that all their clauses hold. """
+
+        model = list(model)
+        for v, value in self.assignment.items():
+            model[v - 1] = value
+
+        for v, clauses in reversed(self.eliminated):
+            model[v - 1] = False
+            for clause in clauses:
+                if not any(model[abs(l) - 1] == (l > 0) for l in clause):
+                    model[v - 1] = v in clause
+                    break
+        return model
+
+
+# function definitions
+
+def preprocess(clauses, n, **options):
+    """ Simplifies clauses, see Preprocessor for the options
+
+        Output: the Preprocessor (result(), stats(), extend(model)) and
+                whether the formula may still be satisfiable """
+
+    p = Preprocessor(clauses, n, **options)
+    return p, p.run()
@@ -1,123 +1,164 @@
 # imports
 
-from random import choice, sample, random
-import matplotlib.pyplot as plt
 import sys
 from time import time
-from statistics import median
-from pysat.solvers import Glucose3
+from threading import Timer
+import numpy as np
+from pysat.solvers import Solver
+
+
+# class definitions
+
+class GlucoseSolver(object):
+    """ Glucose3 (or another pysat solver) with an explicit lifecycle
+
+        Use it as a context manager, the native solver is deleted on exit.
+        Each solve() loads the clauses with one append_formula call and
+        times loading (load_time) and solving (solve_time) in μs.
+
+        With reuse the same native solver serves several instances: every
+        instance gets a selector variable s, its clauses are added as
+        (clause or -s) and solved under the assumption s, and afterwards the
+        unit -s retires them (learnt clauses of an instance contain -s as
+        well).  The solver is replaced after max_uses instances, or when an
+        instance has variables in the range already used for selectors.
+
+        Input:  reuse(boolean), max_uses(integer), name(pysat solver name,
+                one with limited solving for the budgets) """
+
+    def __init__(self, reuse = False, max_uses = 64, name = "glucose3"):
+        self.name = name
+        self.reuse = reuse
+        self.max_uses = max_uses
+        self.solver = None
+        self.load_time = 0.0
+        self.solve_time = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.delete()
+
+    def delete(self):
+        if self.solver is not None:
+            self.solver.delete()
+            self.solver = None
+
+    def _fresh(self, n):
+        self.delete()
+        self.solver = Solver(name = self.name)
+        self.uses = 0
+        self.first_selector = self.next_selector = n + 1
+
+    def solve(self, clauses, n = None, seconds = None, conflicts = None, stats = None):
+        """ Input:  clauses((m, k) int array or list of clauses), n(integer, taken from the
+                    clauses if None), seconds(float), conflicts(integer),
+                    stats(stats.SearchStats)
+
+                    seconds:    wall clock budget, the solver is interrupted
+                                from a timer thread
+                    conflicts:  conflict budget
+                    stats:      receives the solver's own counters for this
+                                instance and the load and solve times
+
+            Output: True, False, or None when a budget ran out """
+
+        if not isinstance(clauses, np.ndarray):
+            clauses = [[int(l) for l in c] for c in clauses]
+        if n is None:
+            n = max((abs(int(l)) for c in clauses for l in c), default = 0)
+
+        start_time = time()
+        if not self.reuse or self.solver is None or self.uses >= self.max_uses or n >= self.first_selector:
+            self._fresh(n)
+        g = self.solver
+
+        assumptions = []
+        if self.reuse:
+            selector = self.next_selector
+            self.next_selector += 1
+            self.uses += 1
+            if isinstance(clauses, np.ndarray):
+                clauses = np.hstack([clauses, np.full((len(clauses), 1), -selector, dtype = clauses.dtype)])
+            else:
+                clauses = [c + [-selector] for c in clauses]
+            assumptions = [selector]
+        g.append_formula(clauses.tolist() if isinstance(clauses, np.ndarray) else clauses)
+        self.load_time = (time() - start_time) * 10**6
+
+        timer = None
+        if conflicts is not None:
+            g.conf_budget(conflicts)
+        if seconds is not None:
+            timer = Timer(seconds, g.interrupt)
+            timer.daemon = True
+            timer.start()
+
+        if stats is not None:
+            before = g.accum_stats()
+
+        start_time = time()
+        if seconds is None and conflicts is None:
+            s = g.solve(assumptions = assumptions)
+        else:
+            s = g.solve_limited(assumptions = assumptions, expect_interrupt = seconds is not None)
+        self.solve_time = (time() - start_time) * 10**6
+
+        if timer is not None:
+            timer.cancel()
+            g.clear_interrupt()
+        if stats is not None:
+            after = g.accum_stats()
+            for name in ("decisions", "propagations", "conflicts", "restarts"):
+                setattr(stats, name, getattr(stats, name) + after.get(name, 0) - before.get(name, 0))
+            stats.seconds["load"] = stats.seconds.get("load", 0.0) + self.load_time / 10**6
+            stats.seconds["solve"] = stats.seconds.get("solve", 0.0) + self.solve_time / 10**6
+        if self.reuse:
+            g.add_clause([-selector])
+        else:
+            self.delete()
+        return s
 
 
 # function definitions
 
-def sat_solver(clauses):
-    """ Wrapper function for Glucose3 SAT solver, for custom style clauses input
-        
-        Input:  list of clauses in the form returned by CNF function
-        Output: boolean value representing satisfiability and runtime in μs """
-
-    g = Glucose3()
-
-    for clause in clauses:
-        clau = list()
-
-        for literal in clause:
-            if literal[0] == 'P':
-                clau.append(int(literal[1:]))
-            else:
-                clau.append(-int(literal[2:]))
+_worker_solvers = dict()
 
-        g.add_clause(clau)
+def worker_solver(name = "glucose3", max_uses = 64):
+    """ The reusable solver of the current (worker) process """
 
-    start_time = time()
-    s = g.solve()
-    call_time = (time() - start_time) * 10**6
-    return s, call_time
+    if name not in _worker_solvers:
+        _worker_solvers[name] = GlucoseSolver(reuse = True, max_uses = max_uses, name = name)
+    return _worker_solvers[name]
 
-def CNF(k, m, n):
-    """ Creates a random Conjunctive Normal Form expression
-    
-    Input:  k(integer), m(integer), n(integer)
-    
-            k:  the number of literals per clause
-            m:  number of clauses in the sentence
-            n:  the number of unique literals in the sentence
-            
-    Example Input:  k = 3
-                    m = 50
-                    n = 50
-                    
-    Output: Returns a list of clauses where each clause is a tuple of literals """
 
-    var_list = ["P" + str(i) for i in range(1, n+1)]
-    not_list = ["~", ""]
-    clause_set = set()
+def sat_solver(clauses, seconds = None, conflicts = None, reuse = False, name = "glucose3", stats = None):
+    """ Wrapper function for Glucose3 SAT solver
+        
+        Input:  clauses as returned by generator.instance, rows of signed ints,
+                seconds(float), conflicts(integer), reuse(boolean),
+                name(pysat solver name), stats(stats.SearchStats)
 
-    while len(clause_set) != m:
-        s = sample(var_list, k)
-        for i in range(len(s)):
-            s[i] = choice(not_list) + s[i]
+                seconds:    wall clock budget
+                conflicts:  conflict budget
+                reuse:      solve on the reusable solver of this process
 
-        clause = tuple(s)
-        clause_set.add(clause)
+        Output: satisfiability (True, False, or None when a budget ran out),
+                solving time and loading time in μs """
 
-    return list(clause_set)
+    if reuse:
+        g = worker_solver(name)
+        s = g.solve(clauses, seconds = seconds, conflicts = conflicts, stats = stats)
+    else:
+        with GlucoseSolver(name = name) as g:
+            s = g.solve(clauses, seconds = seconds, conflicts = conflicts, stats = stats)
+    return s, g.solve_time, g.load_time
 
 
 # Driver Code
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Incorrect syntax, Quitting\n")
-        print("Correct Syntax: python3 main.py literal_per_clause unique_literals iterations_for_probability")
-        quit()
-    else:
-        k, n, j = [int(i) for i in sys.argv[1:]]
-
-    x = []
-    y1 = []
-    y2 = []
-
-    failure = 0
-    for m in range(int(n/4), 8*n+1, int(n/4)):
-        total_solvable = 0
-        total = j
-        avg_flips = 0
-        calls = []
-
-        if failure < 2*j:
-            for i in range(j):
-                clauses = CNF(k, m, n)
-                solvable, call_time = sat_solver(clauses)
-                calls.append(call_time)
-                total_solvable += solvable
-
-        print(m/n)
-
-        x.append(m/n)
-        y1.append(total_solvable/total)
-        y2.append(median(calls))
-
-    # PLOT STUFF
-    fig,ax = plt.subplots(nrows=1, ncols=2, figsize=(25, 10))
-    plt.subplots_adjust(wspace = 0.3, hspace = 0.3)
-    ax[0].grid(b=True, which='major', color='#666666', linestyle='-')
-    ax[0].minorticks_on()
-    ax[0].grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
-    ax[1].grid(b=True, which='major', color='#666666', linestyle='-')
-    ax[1].minorticks_on()
-    ax[1].grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
-
-    ax[0].set_title("Probability vs Clause/Symbol")
-    ax[0].set_xlabel("Clause/Symbol Ratio or m/n")
-    ax[0].set_ylabel("Probability")
-    ax[1].set_title("Runtime")
-    ax[1].set_xlabel("Clause/Symbol Ratio or m/n")
-    ax[1].set_ylabel("runtime in microseconds")
-
-    ax[0].plot(x, y1, label = "Probability", marker = 'o')
-    ax[0].plot([4.3, 4.3], [0, 1], label = "X = 4.3", ls = '--', color = 'red')
-    ax[1].plot(x, y2, label = "Runtime in μs", marker = 'o')
-
-    ax[0].legend()
-    ax[1].legend()
-    fig.savefig("Out.png", dpi=200)
\ No newline at end of file
+    from bench import sweep_driver
+
+    # one process: the single core reference timings
+    sweep_driver("glucose3", sys.argv[1:], processes = 1, script = "psat.py")
@@ -0,0 +1,136 @@
+# imports
+
+import os
+import json
+from time import monotonic
+from statistics import median
+from stats import aggregate
+
+
+# class definitions
+
+class ResultLog(object):
+    """ Append only JSONL log of per instance sweep results
+
+        One line per solved instance: k, n, m, seed, backend, result (true,
+        false or null for UNKNOWN), seconds, killed, config and, when
+        collected, the search stats and preprocessing stats.  config is the
+        run configuration (budgets, preprocessing, stats, process mode, see
+        sweep.run_config) and part of the key: a record is only reused by a
+        run with the same configuration.  Every line is
+        flushed when it is written and the file is fsynced at least every
+        sync_every seconds and on close, so a preempted sweep loses at most
+        that much work.  A line cut off by a crash is ignored when the log
+        is read back.
+
+        Input:  path(string), sync_every(float) """
+
+    def __init__(self, path, sync_every = 1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.done = {key(r): r for r in read_results(path)} if os.path.exists(path) else dict()
+
+        self._file = open(path, "a")
+        if self._file.tell() > 0:
+            self._terminate_line()
+        self._synced = monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _terminate_line(self):
+        # a crash may have left half a line, start on a fresh one
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                self._file.write("\n")
+
+    def get(self, k, n, m, seed, backend, config = None):
+        """ The logged record of an instance under config, or None """
+
+        return self.done.get((k, n, m, seed, backend, config_key(config)))
+
+    def append(self, record):
+        self._file.write(json.dumps(record, sort_keys = True) + "\n")
+        self._file.flush()
+        self.done[key(record)] = record
+
+        if monotonic() - self._synced >= self.sync_every:
+            os.fsync(self._file.fileno())
+            self._synced = monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+
+# function definitions
+
+def config_key(config):
+    return None if config is None else json.dumps(config, sort_keys = True)
+
+
+def key(record):
+    return (record["k"], record["n"], record["m"], record["seed"], record["backend"],
+            config_key(record.get("config")))
+
+
+def read_results(path):
+    """ All complete records of a result log, later duplicates win """
+
+    records = dict()
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue            # cut off by a crash
+            records[key(record)] = record
+    return list(records.values())
+
+
+def summarize(records, backend = None, k = None, n = None, config = None):
+    """ Per ratio statistics of the matching generated-instance records,
+        only those of one run configuration if config is given
+
+        Output: dict (backend, k, n) -> list of dicts with m, ratio,
+                samples, sat, unsat, unknown, killed, probability (among
+                decided instances), median_seconds and the aggregated
+                search stats (None if none were logged), sorted by m """
+
+    groups = dict()
+    for r in records:
+        if r["seed"] < 0:
+            continue                # imported instances are not on a ratio grid
+        if config is not None and config_key(r.get("config")) != config_key(config):
+            continue
+        if (backend or r["backend"], k or r["k"], n or r["n"]) != (r["backend"], r["k"], r["n"]):
+            continue
+        groups.setdefault((r["backend"], r["k"], r["n"]), dict()).setdefault(r["m"], []).append(r)
+
+    summary = dict()
+    for (b, gk, gn), by_m in groups.items():
+        rows = []
+        for m in sorted(by_m):
+            rs = by_m[m]
+            sat = sum(r["result"] is True for r in rs)
+            unsat = sum(r["result"] is False for r in rs)
+            rows.append({
+                "m": m,
+                "ratio": m / gn,
+                "samples": len(rs),
+                "sat": sat,
+                "unsat": unsat,
+                "unknown": len(rs) - sat - unsat,
+                "killed": sum(bool(r.get("killed")) for r in rs),
+                "probability": sat / max(sat + unsat, 1),
+                "median_seconds": median(r["seconds"] for r in rs),
+                "stats": aggregate(r.get("stats") for r in rs),
+            })
+        summary[(b, gk, gn)] = rows
+    return summary
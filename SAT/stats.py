@@ -0,0 +1,88 @@
+# imports
+
+from time import perf_counter
+
+COUNTERS = ("decisions", "propagations", "conflicts", "backtracks", "flips", "restarts")
+
+
+# class definitions
+
+class SearchStats(object):
+    """ Opt-in search statistics of one solver run
+
+        The engines take stats = None by default and then skip all of the
+        bookkeeping; with a SearchStats they count decisions, propagations
+        (implied assignments), conflicts, backtracks, flips and restarts,
+        track the maximum decision depth and add up the time spent per
+        phase (seconds[phase]).
+
+        Input:  callback(function), every(integer), timers(boolean)
+
+                callback:   called with the stats every `every` conflicts
+                            (or flips for local search), e.g. to sample a
+                            long run while it is going on
+                timers:     per phase timing (costs two clock reads per
+                            phase and step) """
+
+    def __init__(self, callback = None, every = 1000, timers = True):
+        self.callback = callback
+        self.every = every
+        self.timers = timers
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.max_depth = 0
+        self.seconds = dict()
+        self.ticks = 0
+
+    def tick(self):
+        """ One conflict or flip, runs the callback when it is due """
+
+        self.ticks += 1
+        if self.callback is not None and self.ticks % self.every == 0:
+            self.callback(self)
+
+    def time(self, phase, start):
+        """ Adds the time since start (a perf_counter value) to phase,
+            returns the current perf_counter value for chaining """
+
+        now = perf_counter()
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + now - start
+        return now
+
+    def depth(self, depth):
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def as_dict(self):
+        result = {name: getattr(self, name) for name in COUNTERS}
+        result["max_depth"] = self.max_depth
+        result["seconds"] = dict(self.seconds)
+        return result
+
+
+# function definitions
+
+def aggregate(stats):
+    """ Combines the as_dict() stats of several runs (None entries are
+        skipped)
+
+        Output: dict with the number of runs, the total and mean of every
+                counter and phase time and the largest max_depth """
+
+    stats = [s for s in stats if s]
+    if not stats:
+        return None
+
+    totals = {name: sum(s.get(name, 0) for s in stats) for name in COUNTERS}
+    seconds = dict()
+    for s in stats:
+        for phase, value in s.get("seconds", {}).items():
+            seconds[phase] = seconds.get(phase, 0.0) + value
+
+    return {
+        "runs": len(stats),
+        "total": dict(totals, seconds = seconds),
+        "mean": dict({name: value / len(stats) for name, value in totals.items()},
+                     seconds = {phase: value / len(stats) for phase, value in seconds.items()}),
+        "max_depth": max(s.get("max_depth", 0) for s in stats),
+    }
@@ -0,0 +1,326 @@
+# imports
+
+import os
+from math import sqrt
+from time import perf_counter
+from multiprocessing import Process, Pipe
+from multiprocessing.connection import wait
+from collections import deque
+from generator import instance
+from instances import load_instance, ratio_grid
+from backends import solve
+from results import ResultLog
+from stats import SearchStats, aggregate
+from preprocess import preprocess
+
+
+# class definitions
+
+class WorkerPool(object):
+    """ Process pool with a watchdog, for tasks that may hang
+
+        Works like Pool.imap_unordered, but every worker gets its chunks
+        over its own pipe, so the parent knows which task a worker is on.
+        A worker that spends more than timeout seconds on one task is
+        killed and replaced; the task is reported as on_timeout(task) and
+        the rest of its chunk goes back to the queue.  A worker that dies is
+        handled the same way.  Without on_timeout a hung or dead worker
+        raises RuntimeError instead.
+
+        Input:  fn(function of one task, defined at module level),
+                processes(integer), timeout(seconds or None),
+                on_timeout(function of the task) """
+
+    def __init__(self, fn, processes, timeout = None, on_timeout = None):
+        self.fn = fn
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self.killed = 0
+        self.workers = [self._start() for i in range(processes)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start(self):
+        parent, child = Pipe()
+        process = Process(target = _worker_loop, args = (self.fn, child), daemon = True)
+        process.start()
+        child.close()
+        return {"process": process, "conn": parent, "chunk": None, "since": None}
+
+    def _kill(self, worker):
+        worker["process"].kill()
+        worker["process"].join()
+        worker["conn"].close()
+        self.killed += 1
+
+    def imap_unordered(self, tasks, chunksize = 1):
+        """ Yields fn(task) for every task in completion order """
+
+        tasks = list(tasks)
+        queue = deque(tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize))
+        outstanding = len(tasks)
+
+        while outstanding:
+            for worker in self.workers:
+                if worker["chunk"] is None and queue:
+                    worker["chunk"] = deque(queue.popleft())
+                    worker["since"] = perf_counter()
+                    worker["conn"].send(list(worker["chunk"]))
+
+            busy = [w for w in self.workers if w["chunk"] is not None]
+            wait_for = None
+            if self.timeout is not None:
+                wait_for = max(0.0, min(w["since"] for w in busy) + self.timeout - perf_counter())
+
+            ready = wait([w["conn"] for w in busy], wait_for)
+            for worker in busy:
+                if worker["conn"] in ready:
+                    try:
+                        ok, value = worker["conn"].recv()
+                    except EOFError:
+                        ok, value = None, "died"    # handled like a hang
+                    else:
+                        if not ok:
+                            raise value
+                        worker["chunk"].popleft()
+                        worker["since"] = perf_counter()
+                        if not worker["chunk"]:
+                            worker["chunk"] = None
+                        outstanding -= 1
+                        yield value
+                        continue
+
+                elif self.timeout is None or perf_counter() - worker["since"] < self.timeout:
+                    continue
+                else:
+                    value = "timed out after {} s".format(self.timeout)
+
+                task = worker["chunk"].popleft()
+                if worker["chunk"]:
+                    queue.appendleft(list(worker["chunk"]))
+                self._kill(worker)
+                self.workers[self.workers.index(worker)] = self._start()
+                if self.on_timeout is None:
+                    raise RuntimeError("Worker {} on task {!r}".format(value, task))
+                outstanding -= 1
+                yield self.on_timeout(task)
+
+    def close(self):
+        for worker in self.workers:
+            if worker["chunk"] is None:
+                worker["conn"].send(None)
+            else:
+                worker["process"].kill()
+        for worker in self.workers:
+            worker["process"].join()
+            worker["conn"].close()
+        self.workers = []
+
+# function definitions
+
+def available_cores():
+    """ Cores this process may run on (respects affinity masks and cgroups
+        pinning where the platform reports it) """
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def wilson_interval(successes, trials, z = 1.96):
+    """ Wilson score interval of a binomial proportion
+
+        Unlike the normal approximation it stays inside [0, 1] and does not
+        collapse to zero width when every sample agrees (p = 0 or 1).
+
+        Output: (low, high) """
+
+    if trials == 0:
+        return 0.0, 1.0
+
+    p = successes / trials
+    denominator = 1 + z*z / trials
+    centre = (p + z*z / (2*trials)) / denominator
+    half = z * sqrt(p*(1 - p) / trials + z*z / (4*trials*trials)) / denominator
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _worker_loop(fn, conn):
+    while True:
+        chunk = conn.recv()
+        if chunk is None:
+            break
+        for task in chunk:
+            try:
+                conn.send((True, fn(task)))
+            except Exception as e:
+                conn.send((False, e))
+
+
+def run_config(budget, processes, corpus = None):
+    """ The run configuration logged with every record, see
+        results.ResultLog; results from another configuration (budget,
+        preprocessing, stats, single process or parallel, corpus) are not
+        reused
+
+        Input:  budget(dict as passed to run_task), processes(integer),
+                corpus(path or None) """
+
+    return dict(budget, parallel = processes > 1, corpus = os.path.abspath(corpus) if corpus else None)
+
+
+def run_task(task):
+    """ Worker side: builds (or reads) instance (k, n, m, seed) and solves it
+
+        Input:  task(backend, corpus, k, n, m, seed, budget), corpus None to
+                generate the instance with generator.instance (a negative
+                seed reads an imported corpus instance, see
+                instances.imported_points), budget a dict
+                of backends.solve limits; with budget["stats"] True the
+                record also holds the search statistics, with
+                budget["preprocess"] True the instance is simplified by
+                preprocess.preprocess first and the record holds its stats
+
+        Output: result record (see results.ResultLog), result None if
+                unknown """
+
+    backend, corpus, k, n, m, seed, budget = task
+    budget = dict(budget)
+    stats = SearchStats(timers = True) if budget.pop("stats", False) else None
+    simplify = budget.pop("preprocess", False)
+    if corpus:
+        clauses = load_instance(corpus, k, n, m, seed)
+    else:
+        clauses = instance(k, m, n, seed)
+
+    start = perf_counter()
+    if simplify:
+        preprocessor, satisfiable = preprocess(clauses, n)
+        clauses = preprocessor.result()
+        result = solve(backend, clauses, n, stats = stats, **budget) if satisfiable else False
+    else:
+        result = solve(backend, clauses, n, stats = stats, **budget)
+    record = {"k": k, "n": n, "m": m, "seed": seed, "backend": backend, "result": result,
+              "seconds": perf_counter() - start, "killed": False}
+    if stats is not None:
+        record["stats"] = stats.as_dict()
+    if simplify:
+        record["preprocess"] = preprocessor.stats()
+    return record
+
+
+def sweep(backend, k, n, samples, ratios = None, min_samples = 8, width = 0.1, z = 1.96,
+          processes = None, corpus = None, progress = None, seconds = None, conflicts = None,
+          flips = None, kill_after = None, log = None, collect_stats = False, simplify = False):
+    """ Adaptive phase transition sweep of one backend
+
+        Input:  backend(name in backends.BACKENDS), k(integer), n(integer),
+                samples(integer), ratios(list of m values), min_samples,
+                width(float), z(float), processes(integer), corpus(path),
+                progress(function), seconds(float), conflicts(integer),
+                flips(integer), kill_after(float)
+
+                samples:    at most this many instances per m
+                ratios:     clause counts, instances.ratio_grid(n) by default
+                width:      a clause count is finished once the Wilson
+                            interval of its SAT probability has a half
+                            width of at most this
+                processes:  pool size, all available cores by default
+                progress:   called with (m, stats) when a clause count is
+                            finished
+                seconds, conflicts, flips:
+                            per instance budgets (see backends.solve), an
+                            instance that exceeds them is UNKNOWN
+                kill_after: seconds after which a worker that is still on
+                            one instance is killed and replaced (the
+                            instance counts as UNKNOWN), by default twice
+                            the time budget plus 5 seconds
+                log:        path of a results.ResultLog; every result is
+                            appended as it arrives and instances already
+                            in the log under the same run_config are not
+                            solved again, so an interrupted sweep continues
+                            where it stopped
+                collect_stats:
+                            workers return the search statistics of every
+                            instance (see stats.SearchStats), they are
+                            logged and aggregated per m in stats[m]["stats"]
+                simplify:   run preprocess.preprocess before every backend
+                            call, the time is part of the instance time
+
+        Every clause count first gets min_samples instances; each further
+        round doubles the samples of the counts whose interval is still too
+        wide, which are the ones near the threshold.  The probability and
+        its interval only count decided (SAT or UNSAT) instances.  Workers
+        generate the instances from their (k, n, m, seed) descriptors,
+        seeds 0, 1, ... per m, and results are collected in completion order.
+
+        Output: dict m -> {"samples", "sat", "unsat", "unknown", "killed",
+                "low", "high", "seconds", "stats"} (seconds is the list of
+                per instance solve times, stats None without collect_stats) """
+
+    ratios = ratio_grid(n) if ratios is None else list(ratios)
+    processes = processes or available_cores()
+    budget = {"seconds": seconds, "conflicts": conflicts, "flips": flips, "stats": collect_stats,
+              "preprocess": simplify}
+    config = run_config(budget, processes, corpus)
+    if kill_after is None and seconds is not None:
+        kill_after = 2*seconds + 5
+
+    stats = {m: {"samples": 0, "sat": 0, "unsat": 0, "unknown": 0, "killed": 0,
+                 "low": 0.0, "high": 1.0, "seconds": [], "stats": None} for m in ratios}
+    search_stats = {m: [] for m in ratios}
+
+    def killed(task):
+        backend, corpus, k, n, m, seed, budget = task
+        return {"k": k, "n": n, "m": m, "seed": seed, "backend": backend, "result": None,
+                "seconds": kill_after, "killed": True, "config": config}
+
+    def record(r):
+        entry = stats[r["m"]]
+        entry[{True: "sat", False: "unsat", None: "unknown"}[r["result"]]] += 1
+        entry["killed"] += r["killed"]
+        entry["seconds"].append(r["seconds"])
+        if r.get("stats"):
+            search_stats[r["m"]].append(r["stats"])
+
+    results = ResultLog(log) if log else None
+    try:
+        pending = {m: min(min_samples, samples) for m in ratios}
+        with WorkerPool(run_task, processes, kill_after, killed) as workers:
+            while pending:
+                tasks = []
+                for m, count in pending.items():
+                    for seed in range(stats[m]["samples"], stats[m]["samples"] + count):
+                        done = results and results.get(k, n, m, seed, backend, config)
+                        if done:
+                            record(done)
+                        else:
+                            tasks.append((backend, corpus, k, n, m, seed, budget))
+                    stats[m]["samples"] += count
+                chunksize = max(1, len(tasks) // (4 * processes))
+
+                for r in workers.imap_unordered(tasks, chunksize):
+                    r["config"] = config
+                    record(r)
+                    if results:
+                        results.append(r)
+
+                finished = list(pending)
+                pending = dict()
+                for m in finished:
+                    entry = stats[m]
+                    entry["low"], entry["high"] = wilson_interval(entry["sat"], entry["sat"] + entry["unsat"], z)
+                    entry["stats"] = aggregate(search_stats[m])
+                    if (entry["high"] - entry["low"]) / 2 > width and entry["samples"] < samples:
+                        pending[m] = min(entry["samples"], samples - entry["samples"])
+                    elif progress is not None:
+                        progress(m, entry)
+    finally:
+        if results:
+            results.close()
+
+    return stats